@@ -8,25 +8,141 @@ Units are functional feature keys (strings) managed by UnitStore, not neurons.
 """
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Tuple, Optional, Iterable
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Set, Tuple, Optional, Iterable, Iterator
 import math
+import numpy as np
 
 Time = float
 UnitKey = str
 Spike = Tuple[Time, UnitKey, float]  # (t, unit_key, strength)
+Slot = float  # calendar slot: an int index, or _OFFGRID_SLOT
 
+# Calendar slot for events whose time (or time / slot width) is not finite.
+# No finite window reaches it; only unbounded windows, which visit every slot.
+_OFFGRID_SLOT: Slot = math.inf
 
-@dataclass
+# Process-wide bit position per unit key, shared by all ensembles so their
+# membership bitmasks are comparable (see CellEnsembleRT.overlap_with). Capped
+# at _MAX_UNIT_BITS keys; ensembles holding keys past the cap use set ops.
+_MAX_UNIT_BITS = 1 << 16
+_unit_bits: Dict[UnitKey, int] = {}
+
+
+def _unit_bit(key: UnitKey) -> Optional[int]:
+    b = _unit_bits.get(key)
+    if b is None and len(_unit_bits) < _MAX_UNIT_BITS:
+        b = _unit_bits[key] = len(_unit_bits)
+    return b
+
+
+class UnitSet(set):
+    """Set of unit keys that counts its own edits in `version`.
+
+    Lets CellEnsembleRT reuse its membership bitmask until the set is edited,
+    including edits made directly on `units`.
+    """
+    __slots__ = ("version",)
+
+    def __init__(self, *args: Iterable[UnitKey]) -> None:
+        super().__init__(*args)
+        self.version = 0
+
+    def add(self, key: UnitKey) -> None:
+        super().add(key)
+        self.version += 1
+
+    def discard(self, key: UnitKey) -> None:
+        super().discard(key)
+        self.version += 1
+
+    def remove(self, key: UnitKey) -> None:
+        super().remove(key)
+        self.version += 1
+
+    def pop(self) -> UnitKey:
+        self.version += 1
+        return super().pop()
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+    def update(self, *others: Iterable[UnitKey]) -> None:
+        super().update(*others)
+        self.version += 1
+
+    def difference_update(self, *others: Iterable[UnitKey]) -> None:
+        super().difference_update(*others)
+        self.version += 1
+
+    def intersection_update(self, *others: Iterable[UnitKey]) -> None:
+        super().intersection_update(*others)
+        self.version += 1
+
+    def symmetric_difference_update(self, other: Iterable[UnitKey]) -> None:
+        super().symmetric_difference_update(other)
+        self.version += 1
+
+    def __ior__(self, other: Set[UnitKey]) -> "UnitSet":
+        self.update(other)
+        return self
+
+    def __iand__(self, other: Set[UnitKey]) -> "UnitSet":
+        self.intersection_update(other)
+        return self
+
+    def __isub__(self, other: Set[UnitKey]) -> "UnitSet":
+        self.difference_update(other)
+        return self
+
+    def __ixor__(self, other: Set[UnitKey]) -> "UnitSet":
+        self.symmetric_difference_update(other)
+        return self
+
+
+class _PairWeights:
+    """Descriptor behind CellEnsembleRT.weights.
+
+    Reads return a read-only view of the pair slots; assigning a mapping
+    (also via the `weights=` init argument) replaces all weights.
+    """
+
+    def __get__(self, obj: Any, objtype: Any = None) -> Any:
+        return self if obj is None else obj._weights_view()
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        if value is not self:  # `self` is the dataclass default: no initial weights
+            obj._load_weights(value)
+
+
+@dataclass(eq=False)  # identity equality: the weight state lives in NumPy arrays
 class CellEnsembleRT:
     name: str
     units: Set[UnitKey] = field(default_factory=set)
     context_tags: Set[str] = field(default_factory=set)
     registry: object = None  # Optional: UnitStore for similarity-aware plasticity
 
-    # Schedule: time -> [(unit_key, strength)]
-    _scheduled: Dict[Time, List[Tuple[UnitKey, float]]] = field(default_factory=dict, repr=False)
-    # Pairwise association weights
-    weights: Dict[Tuple[UnitKey, UnitKey], float] = field(default_factory=dict, repr=False)
+    # Schedule as a calendar queue: slot -> [(t, unit_key, strength)], where
+    # slot = floor(t / _slot_width). Steps only visit the slots they span.
+    # Infinite or NaN times are accepted and kept in _OFFGRID_SLOT.
+    _calendar: Dict[Slot, List[Tuple[Time, UnitKey, float]]] = field(default_factory=dict, repr=False)
+    _slot_width: float = field(default=0.0, repr=False)  # defaults to _dt
+    # Pairwise association weights, one slot per live pair of unit rows i < j
+    # (rows are append-only as units first fire). _pair_slot maps (i, j) to a
+    # slot in the _pair_i/_pair_j/_pair_w arrays; pruned slots get row -1 and
+    # go on _free_slots for reuse, so decay and pruning cost O(pairs).
+    _unit_row: Dict[UnitKey, int] = field(default_factory=dict, repr=False)
+    _unit_keys: List[UnitKey] = field(default_factory=list, repr=False)
+    _pair_slot: Dict[Tuple[int, int], int] = field(default_factory=dict, repr=False)
+    _pair_i: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.intp), repr=False)
+    _pair_j: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.intp), repr=False)
+    _pair_w: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32), repr=False)
+    _n_slots: int = field(default=0, repr=False)  # high-water mark of used slots
+    _free_slots: List[int] = field(default_factory=list, repr=False)
+    _weights_cache: Optional[Dict[Tuple[UnitKey, UnitKey], float]] = field(default=None, repr=False)
+    # Public view of the weights keyed by (a, b), a < b; see _PairWeights
+    weights: Mapping[Tuple[UnitKey, UnitKey], float] = field(default=_PairWeights(), repr=False)
 
     # Plasticity params
     eta_hebb: float = 0.02
@@ -37,33 +153,203 @@ class CellEnsembleRT:
     _t: float = 0.0
     _dt: float = 0.01
     _active_last_step: Set[UnitKey] = field(default_factory=set, repr=False)
+    # Membership as a bitmask over _unit_bits, valid while `units` is still the
+    # UnitSet _mask_units at version _mask_version (None: not expressible)
+    _mask: Optional[int] = field(default=None, repr=False)
+    _mask_units: Optional[UnitSet] = field(default=None, repr=False)
+    _mask_version: int = field(default=-1, repr=False)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.units, UnitSet):
+            self.units = UnitSet(self.units)
+        if self._slot_width <= 0.0:
+            self._slot_width = self._dt
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Bit positions are per process (see _unit_bits), so masks are not pickled
+        state = dict(self.__dict__)
+        state.update(_mask=None, _mask_units=None, _mask_version=-1)
+        return state
 
     # ---------------- Construction ----------------
     def add_units(self, keys: Iterable[UnitKey]) -> None:
         """Add functional unit keys to the ensemble's membership set."""
         for k in keys:
-            self.units.add(k)
+            self._add_unit(k)
+
+    def _add_unit(self, key: UnitKey) -> None:
+        units = self.units
+        if key in units:
+            return
+        in_sync = self._mask is not None and self._mask_current()
+        units.add(key)
+        if in_sync:
+            b = _unit_bit(key)
+            if b is None:
+                self._mask_units = None
+            else:
+                self._mask |= 1 << b
+                self._mask_version = units.version
+
+    def _mask_current(self) -> bool:
+        u = self.units
+        return self._mask_units is u and self._mask_version == u.version
+
+    def _membership_mask(self) -> Optional[int]:
+        """Bitmask of `units`, rebuilt after any edit to the set.
+
+        None when `units` is not a UnitSet (edits cannot be tracked) or holds
+        keys past the _unit_bits cap; callers then fall back to set ops.
+        """
+        u = self.units
+        if not isinstance(u, UnitSet):
+            return None
+        if not self._mask_current():
+            mask: Optional[int] = 0
+            for k in u:
+                b = _unit_bit(k)
+                if b is None:
+                    mask = None
+                    break
+                mask |= 1 << b
+            self._mask, self._mask_units, self._mask_version = mask, u, u.version
+        return self._mask
 
     def schedule_spike(self, t: Time, key: UnitKey, strength: float = 1.0) -> None:
         """Schedule a unit activation at absolute time t with strength in [0,1]."""
-        if key not in self.units:
-            self.units.add(key)
+        self._add_unit(key)
         s = max(0.0, min(1.0, strength))
-        self._scheduled.setdefault(float(t), []).append((key, s))
+        t = float(t)
+        self._calendar.setdefault(self._slot(t), []).append((t, key, s))
 
     def schedule_pattern(self, spikes: Iterable[Spike]) -> None:
         """Bulk-schedule many spikes: iterable of (t, key, strength)."""
         for t, k, s in spikes:
             self.schedule_spike(t, k, s)
 
+    def _weights_view(self) -> Mapping[Tuple[UnitKey, UnitKey], float]:
+        """Read-only mapping of pair weights, rebuilt only after they change."""
+        if self._weights_cache is None:
+            out: Dict[Tuple[UnitKey, UnitKey], float] = {}
+            ii, jj, ww = self._weight_entries()
+            for i, j, w in zip(ii.tolist(), jj.tolist(), ww.tolist()):
+                a, b = self._unit_keys[i], self._unit_keys[j]
+                out[(a, b) if a < b else (b, a)] = w
+            self._weights_cache = out
+        return MappingProxyType(self._weights_cache)
+
+    def _load_weights(self, weights: Mapping[Tuple[UnitKey, UnitKey], float]) -> None:
+        """Replace all pair weights with `weights` ((a, b) -> w, either order)."""
+        self._pair_slot.clear()
+        self._free_slots.clear()
+        self._n_slots = 0
+        self._pair_i[:] = -1
+        self._pair_j[:] = -1
+        self._pair_w[:] = 0.0
+        self._weights_cache = None
+        merged: Dict[Tuple[int, int], float] = {}
+        for (a, b), w in weights.items():
+            i, j = self._rows_for((a, b)).tolist()
+            merged[(i, j) if i < j else (j, i)] = float(w)
+        if merged:
+            ri, rj = (np.array(r, dtype=np.intp) for r in zip(*merged))
+            slots = self._slots_for(ri, rj)  # may grow the slot arrays
+            self._pair_w[slots] = np.array(list(merged.values()), dtype=np.float32)
+
+    def _weight_entries(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Live weights as (row_i, row_j, w) arrays."""
+        n = self._n_slots
+        live = np.flatnonzero(self._pair_i[:n] >= 0)
+        return self._pair_i[live], self._pair_j[live], self._pair_w[live].astype(np.float64)
+
+    def _rows_for(self, keys: Iterable[UnitKey]) -> np.ndarray:
+        """Return unit rows for `keys`, assigning rows to first-seen units."""
+        for k in keys:
+            if k not in self._unit_row:
+                self._unit_row[k] = len(self._unit_keys)
+                self._unit_keys.append(k)
+        return np.array([self._unit_row[k] for k in keys], dtype=np.intp)
+
+    def _slots_for(self, ri: np.ndarray, rj: np.ndarray) -> np.ndarray:
+        """Return weight slots for row pairs (ri[k], rj[k]), allocating new ones."""
+        pairs = list(zip(ri.tolist(), rj.tolist()))
+        slot_of = self._pair_slot
+        slots = np.array([slot_of.get(p, -1) for p in pairs], dtype=np.intp)
+        new = np.flatnonzero(slots < 0)
+        if new.size:
+            cut = len(self._free_slots) - min(new.size, len(self._free_slots))
+            reuse = self._free_slots[cut:]
+            del self._free_slots[cut:]
+            fresh = np.arange(self._n_slots, self._n_slots + new.size - len(reuse), dtype=np.intp)
+            self._n_slots += fresh.size
+            if self._n_slots > self._pair_w.size:
+                cap = max(self._n_slots, 2 * self._pair_w.size)
+                self._pair_i = np.concatenate((self._pair_i, np.full(cap - self._pair_i.size, -1, dtype=np.intp)))
+                self._pair_j = np.concatenate((self._pair_j, np.full(cap - self._pair_j.size, -1, dtype=np.intp)))
+                self._pair_w = np.concatenate((self._pair_w, np.zeros(cap - self._pair_w.size, dtype=np.float32)))
+            slots[new] = np.concatenate((np.array(reuse, dtype=np.intp), fresh))
+            self._pair_i[slots[new]] = ri[new]
+            self._pair_j[slots[new]] = rj[new]
+            for k, sl in zip(new.tolist(), slots[new].tolist()):
+                slot_of[pairs[k]] = sl
+        return slots
+
+    def _slot(self, t: Time) -> Slot:
+        """Calendar slot holding events at time t."""
+        q = t / self._slot_width
+        return math.floor(q) if math.isfinite(q) else _OFFGRID_SLOT
+
+    def _slots_between(self, t0: Time, t1: Time) -> Iterator[Slot]:
+        """Lazily yield occupied calendar slots that may hold events in [t0, t1].
+
+        May iterate the calendar itself, so snapshot it before deleting slots.
+        """
+        cal = self._calendar
+        lo, hi = self._slot(t0), self._slot(t1)
+        if lo == _OFFGRID_SLOT or hi == _OFFGRID_SLOT:
+            return iter(cal)
+        if hi - lo < len(cal):
+            return (i for i in range(lo, hi + 1) if i in cal)
+        return (i for i in cal if lo <= i <= hi)
+
     # ---------------- Dynamics ---------------------
-    def _hebb_increment(self, a: UnitKey, b: UnitKey) -> float:
-        """Return a similarity-scaled Hebbian increment for pair (a, b)."""
+    def _hebb_increments(self, keys: List[UnitKey]) -> np.ndarray:
+        """Return a (k, k) matrix of similarity-scaled Hebbian increments."""
         base = self.eta_hebb
         if self.registry and hasattr(self.registry, "cosine"):
-            sim = max(0.0, float(self.registry.cosine(a, b)))  # 0..1
-            return base * (0.5 + 0.5 * sim)
-        return base
+            if hasattr(self.registry, "cosine_matrix"):
+                sim = np.asarray(self.registry.cosine_matrix(keys), dtype=np.float64)
+            else:
+                sim = np.array([[self.registry.cosine(a, b) for b in keys] for a in keys], dtype=np.float64)
+            return base * (0.5 + 0.5 * np.maximum(sim, 0.0))  # sim clipped to 0..1
+        return np.full((len(keys), len(keys)), base, dtype=np.float64)
+
+    def _apply_plasticity(self, ri: np.ndarray, rj: np.ndarray, incr: np.ndarray) -> None:
+        """Decay, prune and Hebbian-update the pair weights in one call.
+
+        `ri`/`rj` are the unit rows (ri < rj) of pairs that co-fired this
+        step and `incr` their increments. Decay and pruning touch the used
+        slots only, the increment only the co-fired pairs.
+        """
+        n = self._n_slots
+        if n == 0 and ri.size == 0:
+            return
+        w = self._pair_w[:n]
+        np.multiply(w, self.decay, out=w)
+        dead = np.flatnonzero((np.abs(w) < 1e-6) & (self._pair_i[:n] >= 0))
+        if dead.size:
+            for i, j in zip(self._pair_i[dead].tolist(), self._pair_j[dead].tolist()):
+                del self._pair_slot[(i, j)]
+            self._pair_i[dead] = -1
+            self._pair_j[dead] = -1
+            w[dead] = 0.0
+            self._free_slots.extend(dead.tolist())
+        if ri.size:
+            slots = self._slots_for(ri, rj)
+            v = self._pair_w[slots] + incr
+            np.minimum(v, self.max_weight, out=v)  # branchless clamp
+            self._pair_w[slots] = v
+        self._weights_cache = None
 
     def activate_step(self, dt: Optional[float] = None) -> Set[UnitKey]:
         """Advance time by dt, apply scheduled spikes, decay, and Hebbian updates."""
@@ -72,31 +358,32 @@ class CellEnsembleRT:
         t0, t1 = self._t, self._t + dt
         fired_now: Set[UnitKey] = set()
 
-        to_delete: List[Time] = []
-        for ts, events in self._scheduled.items():
-            if t0 < ts <= t1:
-                for k, s in events:
-                    fired_now.add(k)
-                to_delete.append(ts)
-        for ts in to_delete:
-            del self._scheduled[ts]
-
-        # Decay
-        if self.weights:
-            for k in list(self.weights.keys()):
-                self.weights[k] *= self.decay
-                if abs(self.weights[k]) < 1e-6:
-                    del self.weights[k]
-
-        # Hebbian on co-activated units
-        if fired_now:
+        for slot in list(self._slots_between(t0, t1)):
+            pending: List[Tuple[Time, UnitKey, float]] = []
+            for ev in self._calendar[slot]:
+                if t0 < ev[0] <= t1:
+                    fired_now.add(ev[1])
+                else:
+                    pending.append(ev)
+            if pending:
+                self._calendar[slot] = pending
+            else:
+                del self._calendar[slot]
+
+        # Hebbian increments on co-activated units (upper triangle of the fired block)
+        ri = rj = np.zeros(0, dtype=np.intp)
+        incr = np.zeros(0, dtype=np.float32)
+        if len(fired_now) > 1:
             fl = list(fired_now)
-            for i in range(len(fl)):
-                for j in range(i + 1, len(fl)):
-                    a, b = fl[i], fl[j]
-                    key = (a, b) if a < b else (b, a)
-                    w = self.weights.get(key, 0.0) + self._hebb_increment(a, b)
-                    self.weights[key] = min(w, self.max_weight)
+            rows = self._rows_for(fl)
+            order = np.argsort(rows)
+            rows = rows[order]
+            inc = self._hebb_increments([fl[i] for i in order])
+            iu, ju = np.triu_indices(len(rows), k=1)
+            ri, rj = rows[iu], rows[ju]
+            incr = inc[iu, ju].astype(np.float32)
+
+        self._apply_plasticity(ri, rj, incr)
 
         self._active_last_step = fired_now
         self._t = t1
@@ -107,23 +394,37 @@ class CellEnsembleRT:
         """Jaccard overlap of membership sets (0..1)."""
         if not self.units and not other.units:
             return 1.0
-        inter = len(self.units & other.units)
-        union = len(self.units | other.units)
+        a, b = self._membership_mask(), other._membership_mask()
+        if a is None or b is None:
+            inter = len(self.units & other.units)
+            union = len(self.units | other.units)
+        else:
+            inter, union = (a & b).bit_count(), (a | b).bit_count()
         return inter / union if union > 0 else 0.0
 
     def similarity(self, other: "CellEnsembleRT") -> float:
         """Blend of membership overlap and weight-topology likeness (0..1)."""
         m = self.overlap_with(other)
-        keys = set(self.weights.keys()) | set(other.weights.keys())
-        if not keys:
+        ai, aj, wa = self._weight_entries()
+        bi, bj, wb = other._weight_entries()
+        if wa.size == 0 and wb.size == 0:
             return m
-        dot = a2 = b2 = 0.0
-        for k in keys:
-            wa = self.weights.get(k, 0.0)
-            wb = other.weights.get(k, 0.0)
-            dot += wa * wb
-            a2 += wa * wa
-            b2 += wb * wb
+        # Shared unit ids: our rows first, then units only `other` has seen
+        ids = dict(self._unit_row)
+        for k in other._unit_keys:
+            ids.setdefault(k, len(ids))
+        to_shared = np.array([ids[k] for k in other._unit_keys], dtype=np.intp)
+        bi, bj = to_shared[bi], to_shared[bj]
+        # Encode each unordered pair as one integer and align both sides on the union
+        n = len(ids)
+        ca = np.minimum(ai, aj) * n + np.maximum(ai, aj)
+        cb = np.minimum(bi, bj) * n + np.maximum(bi, bj)
+        _, inv = np.unique(np.concatenate((ca, cb)), return_inverse=True)
+        S = np.zeros((2, int(inv.max()) + 1), dtype=np.float64)
+        S[0, inv[: ca.size]] = wa
+        S[1, inv[ca.size :]] = wb
+        # One Gram product yields dot, a2 and b2 in a single pass over S
+        (a2, dot), (_, b2) = (S @ S.T).tolist()
         topo = dot / (math.sqrt(a2) * math.sqrt(b2)) if a2 > 0 and b2 > 0 else 0.0
         return 0.6 * m + 0.4 * max(0.0, topo)
 
@@ -131,10 +432,14 @@ class CellEnsembleRT:
         """Counts per unit within [t0, t1] for downstream decoders."""
         t0, t1 = window
         order = unit_order or sorted(self.units)
-        counts = {k: 0.0 for k in order}
-        for ts, events in self._scheduled.items():
-            if t0 <= ts <= t1:
-                for k, s in events:
-                    if k in counts:
-                        counts[k] += s
-        return [counts[k] for k in order]
+        index = {k: i for i, k in enumerate(dict.fromkeys(order))}
+        rows: List[int] = []
+        strengths: List[float] = []
+        for slot in self._slots_between(t0, t1):
+            for ts, k, s in self._calendar[slot]:
+                if t0 <= ts <= t1 and k in index:
+                    rows.append(index[k])
+                    strengths.append(s)
+        counts = np.zeros(len(index), dtype=np.float64)
+        np.add.at(counts, rows, strengths)
+        return counts[np.fromiter((index[k] for k in order), dtype=np.intp, count=len(order))].tolist()
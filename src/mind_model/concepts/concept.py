@@ -7,9 +7,31 @@ and engram I/O.
 """
 from __future__ import annotations
 from typing import Dict, Any, Optional, List, Tuple
+import math
+import operator
 import uuid
+import numpy as np
 from mind_model.concepts.feature_ensemble import FeatureEnsemble
 from mind_model.relationships.relationships import RelationshipEdge
+from mind_model.utils.vector_utils import VectorLike, top_k_indices
+
+# Below this many ensembles, stimulate(), decay_all() and recall_partial() run
+# per ensemble in plain Python: building and scattering the row arrays costs
+# more than it saves. For stimulate() the measured crossover is ~16 rows
+# (4-d vectors, 3 links each, half the rows cued); the seed concepts have four
+# ensembles.
+_BATCH_MIN_ROWS = 16
+
+
+def _cue_cosine(ens: FeatureEnsemble, cue: VectorLike) -> float:
+    """FeatureEnsemble.similarity, with short list cues scored without NumPy."""
+    u = ens._unit_vector
+    if isinstance(cue, (list, tuple)) and u.ndim == 1:
+        if not cue or len(cue) != u.size:
+            return 0.0
+        n = math.hypot(*cue)
+        return sum(map(operator.mul, u.tolist(), cue)) / n if n > 0.0 else 0.0
+    return ens.similarity(cue)
 
 
 class Concept:
@@ -29,41 +51,157 @@ class Concept:
         self.metadata: Dict[str, Any] = metadata or {"version": "3.0"}
 
         # Ensembles and lookup tables
-        self.ensembles_by_id: Dict[uuid.UUID, FeatureEnsemble] = {}
-        self.ensembles_by_name: Dict[str, uuid.UUID] = {}
+        self.ensembles_by_id: Dict[int, FeatureEnsemble] = {}
+        self.ensembles_by_name: Dict[str, int] = {}
 
         # Inter-concept relationships
         self.relationships: List[RelationshipEdge] = []
+        self._rel_version: int = 0  # bumped by add_relationship(); keys relation caches
 
         # Dynamics params
         self.inhibition_gain: float = inhibition_gain
         self.activation_threshold: float = activation_threshold
 
+        # Row-major (SoA) caches for batched math, rebuilt lazily by _refresh_layout()
+        self._layout_version: int = 0
+        self._layout_key: Tuple[int, int, int] = (-1, -1, -1)
+        self._rows: List[FeatureEnsemble] = []
+        self._ensemble_row_index: Dict[str, int] = {}
+        self._ensemble_matrix: Optional[np.ndarray] = None  # (rows, dim) unit vectors
+        self._activations: np.ndarray = np.zeros(0, dtype=np.float64)
+        # Intra-assembly links as COO edge arrays (source row, target row, weight)
+        self._link_src: np.ndarray = np.zeros(0, dtype=np.intp)
+        self._link_dst: np.ndarray = np.zeros(0, dtype=np.intp)
+        self._link_w: np.ndarray = np.zeros(0, dtype=np.float64)
+
     # ---------------- Ensemble management ----------------
     def add_ensemble(self, ensemble: FeatureEnsemble) -> None:
-        """Register a FeatureEnsemble with this Concept."""
+        """Register a FeatureEnsemble with this Concept.
+
+        Raises ValueError if a different ensemble already holds its id (for
+        example a copy.copy() of a registered ensemble).
+        """
+        held = self.ensembles_by_id.get(ensemble.ensemble_id)
+        if held is not None and held is not ensemble:
+            raise ValueError(f"ensemble id {ensemble.ensemble_id} is already used by {held.name!r}")
         self.ensembles_by_id[ensemble.ensemble_id] = ensemble
         self.ensembles_by_name[ensemble.name] = ensemble.ensemble_id
+        self._layout_version += 1
 
     def get_ensemble(self, name: str) -> Optional[FeatureEnsemble]:
         """Retrieve a FeatureEnsemble by its name."""
         e_id = self.ensembles_by_name.get(name)
-        return self.ensembles_by_id.get(e_id) if e_id else None
+        return self.ensembles_by_id.get(e_id) if e_id is not None else None
+
+    def _refresh_layout(self) -> None:
+        """Rebuild row caches if ensembles, their vectors, or their links changed.
+
+        `_ensemble_matrix` stacks the ensembles' unit vectors so cues can be
+        scored with one batched dot; it is None when vector shapes differ.
+        Link edits are seen through each ensemble's LinkDict.version. Links
+        to ensembles outside this Concept are ignored.
+        """
+        key = (
+            self._layout_version,
+            len(self.ensembles_by_id),
+            sum(e._vector_gen + e.links.version for e in self.ensembles_by_id.values()),
+        )
+        if key == self._layout_key:
+            return
+        self._rows = list(self.ensembles_by_id.values())
+        row_of_id = {e.ensemble_id: i for i, e in enumerate(self._rows)}
+        self._ensemble_row_index = {n: row_of_id[eid] for n, eid in self.ensembles_by_name.items()}
+        shapes = {e.vector.shape for e in self._rows}
+        if len(shapes) == 1 and len(next(iter(shapes))) == 1:
+            self._ensemble_matrix = np.stack([e._unit_vector for e in self._rows])
+        else:
+            self._ensemble_matrix = None
+
+        edges = [
+            (i, row_of_id[t], w)
+            for i, e in enumerate(self._rows)
+            for t, w in e.links.items()
+            if t in row_of_id
+        ]
+        src, dst, w = zip(*edges) if edges else ((), (), ())
+        self._link_src = np.array(src, dtype=np.intp)
+        self._link_dst = np.array(dst, dtype=np.intp)
+        self._link_w = np.array(w, dtype=np.float64)
+        self._layout_key = key
+
+    @property
+    def layout_version(self) -> int:
+        """Bumped by add_ensemble(); row order is stable between bumps."""
+        return self._layout_version
+
+    def ensemble_index(self) -> Dict[str, int]:
+        """Map ensemble name -> row in activation_vector()."""
+        self._refresh_layout()
+        return dict(self._ensemble_row_index)
+
+    def activation_vector(self) -> np.ndarray:
+        """Current ensemble activations as a float64 array in row order."""
+        self._refresh_layout()
+        return np.array([e.activation for e in self._rows], dtype=np.float64)
+
+    def _pull_activations(self) -> np.ndarray:
+        """Gather ensemble activations into the row-ordered `_activations` array."""
+        self._activations = self.activation_vector()
+        return self._activations
+
+    def _push_activations(self) -> None:
+        """Write `_activations` back to the ensembles (the public source of truth)."""
+        for e, a in zip(self._rows, self._activations.tolist()):
+            e.activation = a
+
+    def _cue_similarities(self, cues: Dict[str, VectorLike]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (rows, sims): cosine of each cue against the ensemble it names.
+
+        Cues naming unknown ensembles are dropped; cues whose shape does not
+        match the ensemble vector score 0.0, as in FeatureEnsemble.similarity.
+        Expects _refresh_layout() to have run (stimulate() does so).
+        """
+        index = self._ensemble_row_index
+        names = [n for n in cues if n in index]
+        rows = np.array([index[n] for n in names], dtype=np.intp)
+        M = self._ensemble_matrix
+        if M is None:
+            sims = [self._rows[r].similarity(cues[n]) for r, n in zip(rows.tolist(), names)]
+            return rows, np.array(sims, dtype=np.float64)
+
+        dim = M.shape[1]
+        vecs = [cues[n] for n in names]
+        if all(len(v) == dim for v in vecs):
+            ok = rows
+            C = np.array(vecs, dtype=np.float32).reshape(len(vecs), dim)
+        else:
+            keep = [i for i, v in enumerate(vecs) if len(v) == dim]
+            ok = rows[keep]
+            C = np.array([vecs[i] for i in keep], dtype=np.float32).reshape(len(keep), dim)
+        dots = np.einsum("ij,ij->i", M[ok], C)
+        norms = np.sqrt(np.einsum("ij,ij->i", C, C))
+        norms[norms == 0.0] = 1.0  # zero cue -> zero dot
+        return ok, dots / norms
 
     # ---------------- Activation & inhibition --------------
     def _lateral_inhibition(self) -> None:
-        """Divisive normalization across all ensembles to enforce competition."""
-        total = sum(max(0.0, e.activation) for e in self.ensembles_by_id.values())
+        """Divisive normalization of `_activations` to enforce competition."""
+        a = self._activations
+        total = float(a[a > 0.0].sum())
         if total <= 1e-9:
             return
-        denom = 1.0 + self.inhibition_gain * total
-        for e in self.ensembles_by_id.values():
-            e.activation = e.activation / denom
+        a /= 1.0 + self.inhibition_gain * total
 
     def decay_all(self, fraction: float = 0.1) -> None:
         """Apply activation decay to all ensembles."""
-        for e in self.ensembles_by_id.values():
-            e.decay(fraction=fraction)
+        if len(self.ensembles_by_id) < _BATCH_MIN_ROWS:
+            for e in self.ensembles_by_id.values():
+                e.decay(fraction=fraction)
+            return
+        f = max(0.0, min(1.0, fraction))
+        self._pull_activations()
+        self._activations *= (1.0 - f)
+        self._push_activations()
 
     # ---------------- Learning -----------------------------
     def learn_hebbian(self, learning_rate: float = 0.05, min_activation: Optional[float] = None) -> None:
@@ -75,7 +213,7 @@ class Concept:
                 e.hebbian(coactive_ids=coactive_ids, learning_rate=learning_rate)
 
     # ------------- Stimulation & completion ----------------
-    def stimulate(self, cues: Dict[str, List[float]], gain: float = 1.0) -> Dict[str, float]:
+    def stimulate(self, cues: Dict[str, VectorLike], gain: float = 1.0) -> Dict[str, float]:
         """Provide partial cues and perform one activation step.
 
         Steps
@@ -83,55 +221,95 @@ class Concept:
         1) Direct activation from cues by cosine similarity
         2) One-step spread along intra-assembly links
         3) Lateral inhibition
+
+        Small concepts (under _BATCH_MIN_ROWS ensembles) take a per-ensemble
+        path; larger ones batch all three steps over row arrays.
         """
-        # 1) Direct activation
-        for name, vec in cues.items():
-            ens = self.get_ensemble(name)
-            if ens:
-                ens.activation += gain * ens.similarity(vec)
-
-        # 2) One-step spread
-        delta: Dict[uuid.UUID, float] = {eid: 0.0 for eid in self.ensembles_by_id}
-        for s_id, s in self.ensembles_by_id.items():
-            if s.activation <= 0.0:
-                continue
-            for t_id, w in s.links.items():
-                delta[t_id] = delta.get(t_id, 0.0) + s.activation * w
-        for t_id, d in delta.items():
-            self.ensembles_by_id[t_id].activation += d
+        if len(self.ensembles_by_id) < _BATCH_MIN_ROWS:
+            self._stimulate_scalar(cues, gain)
+            return {ens.name: round(ens.activation, 4) for ens in self.ensembles_by_id.values()}
+
+        a = self._pull_activations()
+
+        # 1) Direct activation (all cues scored in one batched dot)
+        rows, sims = self._cue_similarities(cues)
+        np.add.at(a, rows, gain * sims)
+
+        # 2) One-step spread from positively active sources
+        src_act = np.maximum(a[self._link_src], 0.0)
+        a += np.bincount(self._link_dst, weights=src_act * self._link_w, minlength=a.size)
 
         # 3) Normalize
         self._lateral_inhibition()
 
+        self._push_activations()
         return {ens.name: round(ens.activation, 4) for ens in self.ensembles_by_id.values()}
 
+    def _stimulate_scalar(self, cues: Dict[str, VectorLike], gain: float) -> None:
+        """stimulate() steps 1-3 applied ensemble by ensemble."""
+        by_id = self.ensembles_by_id
+        for name, vec in cues.items():
+            ens = self.get_ensemble(name)
+            if ens is not None:
+                ens.activation += gain * _cue_cosine(ens, vec)
+
+        delta: Dict[int, float] = {}
+        for s in by_id.values():
+            a = s.activation
+            if a > 0.0:
+                for t, w in s.links.items():
+                    if t in by_id:
+                        delta[t] = delta.get(t, 0.0) + a * w
+        for t, d in delta.items():
+            by_id[t].activation += d
+
+        total = sum(a for e in by_id.values() if (a := e.activation) > 0.0)
+        if total > 1e-9:
+            denom = 1.0 + self.inhibition_gain * total
+            for e in by_id.values():
+                e.activation /= denom
+
     def recall_partial(self, top_k: int = 3) -> List[Tuple[str, float]]:
         """Return the top-k most active ensembles after a stimulate() call."""
-        items = [(e.name, e.activation) for e in self.ensembles_by_id.values()]
-        items.sort(key=lambda x: x[1], reverse=True)
-        return items[:top_k]
+        if len(self.ensembles_by_id) < _BATCH_MIN_ROWS:
+            items = [(e.name, e.activation) for e in self.ensembles_by_id.values()]
+            items.sort(key=lambda x: x[1], reverse=True)
+            return items[:top_k]
+        a = self.activation_vector()
+        return [(self._rows[i].name, float(a[i])) for i in top_k_indices(a, top_k).tolist()]
 
     # ------------- Inter-concept graph ---------------------
     def add_relationship(self, relation_type: str, target_concept_id: uuid.UUID, description: str = "") -> None:
         """Attach a labeled semantic relationship to another concept."""
         self.relationships.append(RelationshipEdge(relation_type, target_concept_id, description))
+        self._rel_version += 1
+
+    @property
+    def rel_version(self) -> int:
+        """Bumped by add_relationship(); lets callers cache relation views."""
+        return self._rel_version
 
     # ------------- Engram I/O ------------------------------
     def serialize_engram(self) -> Dict[str, Any]:
-        """Serialize the concept with ensembles and intra-assembly links."""
+        """Serialize the concept with ensembles and intra-assembly links.
+
+        Ensembles are identified by their external UUIDs; links to ensembles
+        outside this concept are not serialized.
+        """
+        uuids = {eid: str(e.external_id()) for eid, e in self.ensembles_by_id.items()}
         return {
             "concept_id": str(self.concept_id),
             "name": self.name,
             "description": self.description,
             "ensembles": [
                 {
-                    "ensemble_id": str(e.ensemble_id),
+                    "ensemble_id": uuids[eid],
                     "name": e.name,
                     "modality": e.modality,
-                    "vector": e.vector,
-                    "links": {str(t): w for t, w in e.links.items()},
+                    "vector": e.vector.tolist(),
+                    "links": {uuids[t]: w for t, w in e.links.items() if t in uuids},
                 }
-                for e in self.ensembles_by_id.values()
+                for eid, e in self.ensembles_by_id.items()
             ],
             "relationships": [
                 {
@@ -160,28 +338,27 @@ class Concept:
         )
         c.concept_id = uuid.UUID(data["concept_id"])
 
-        # Ensembles
+        # Ensembles (fresh int ids; the engram UUID is kept for round-trips)
+        by_uuid: Dict[uuid.UUID, FeatureEnsemble] = {}
         for ed in data.get("ensembles", []):
             e = FeatureEnsemble(
                 name=ed["name"],
                 modality=ed.get("modality", "unknown"),
                 vector=ed.get("vector", []),
             )
-            e.ensemble_id = uuid.UUID(ed["ensemble_id"])  # preserve
+            e.ensemble_uuid = uuid.UUID(ed["ensemble_id"])  # preserve
+            by_uuid[e.ensemble_uuid] = e
             c.add_ensemble(e)
 
         # Links
         for ed in data.get("ensembles", []):
-            s_id = uuid.UUID(ed["ensemble_id"])
-            s = c.ensembles_by_id[s_id]
+            s = by_uuid[uuid.UUID(ed["ensemble_id"])]
             for t_str, w in ed.get("links", {}).items():
-                s.links[uuid.UUID(t_str)] = w
+                t = by_uuid.get(uuid.UUID(t_str))
+                if t is not None:
+                    s.add_link(t.ensemble_id, w)
 
         # Relationships
         for rd in data.get("relationships", []):
-            c.relationships.append(
-                RelationshipEdge(
-                    rd["type"], uuid.UUID(rd["target_concept_id"]), rd.get("description", "")
-                )
-            )
+            c.add_relationship(rd["type"], uuid.UUID(rd["target_concept_id"]), rd.get("description", ""))
         return c
@@ -6,34 +6,79 @@ Maps ensemble/assembly activity to symbolic labels. Two decoders provided:
 - LinearReadoutDecoder: simple linear layer over concatenated activations.
 """
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import weakref
 import numpy as np
 from mind_model.concepts.concept import Concept
+from mind_model.utils.vector_utils import top_k_indices
+
+LabelSnapshot = Tuple[Tuple[str, Tuple[str, ...]], ...]  # frozen label_to_ensembles
 
 
 @dataclass
 class PopulationThresholdDecoder:
-    """Rule-based decoder using named ensembles and a threshold per label."""
+    """Rule-based decoder using named ensembles and a threshold per label.
+
+    Labels are compiled into a (labels x ensembles) incidence matrix for the
+    concept's row layout, so decoding is one matrix-vector product. The
+    matrix is rebuilt when the concept, its layout or `label_to_ensembles`
+    changes.
+    """
     label_to_ensembles: Dict[str, List[str]]
     threshold: float = 0.25
 
-    def decode(self, concept: Concept) -> List[Tuple[str, float]]:
-        """Return (label, score) for labels that pass the threshold."""
-        results: List[Tuple[str, float]] = []
-        for label, names in self.label_to_ensembles.items():
-            if not names:
-                continue
-            s = 0.0
-            for n in names:
-                e = concept.get_ensemble(n)
-                if e:
-                    s += e.activation
-            score = s / max(1, len(names))
-            if score >= self.threshold:
-                results.append((label, float(score)))
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results
+    _labels: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    _M: np.ndarray = field(default_factory=lambda: np.zeros((0, 0)), init=False, repr=False, compare=False)
+    _row_counts: np.ndarray = field(default_factory=lambda: np.zeros(0), init=False, repr=False, compare=False)
+    # (weakref to the prepared Concept, its layout_version, label snapshot);
+    # concept ids are not unique across copies, so the object itself is the
+    # cache key. Not pickled.
+    _prepared_for: Optional[Tuple["weakref.ref[Concept]", int, LabelSnapshot]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        state["_prepared_for"] = None
+        return state
+
+    def _label_snapshot(self) -> LabelSnapshot:
+        return tuple((label, tuple(names)) for label, names in self.label_to_ensembles.items())
+
+    def prepare(self, concept: Concept) -> None:
+        """Build the incidence matrix for `concept`'s current ensemble rows."""
+        index = concept.ensemble_index()
+        self._labels = [label for label, names in self.label_to_ensembles.items() if names]
+        M = np.zeros((len(self._labels), len(concept.ensembles_by_id)), dtype=np.float64)
+        for i, label in enumerate(self._labels):
+            for n in self.label_to_ensembles[label]:
+                r = index.get(n)
+                if r is not None:
+                    M[i, r] += 1.0
+        self._M = M
+        self._row_counts = np.array(
+            [len(self.label_to_ensembles[label]) for label in self._labels], dtype=np.float64
+        )
+        self._prepared_for = (weakref.ref(concept), concept.layout_version, self._label_snapshot())
+
+    def decode(self, concept: Concept, top_k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Return (label, score) for labels that pass the threshold, best first.
+
+        With `top_k`, only the k best labels are selected and sorted.
+        """
+        p = self._prepared_for
+        if (
+            p is None
+            or p[0]() is not concept
+            or p[1] != concept.layout_version
+            or p[2] != self._label_snapshot()
+        ):
+            self.prepare(concept)
+        scores = (self._M @ concept.activation_vector()) / self._row_counts
+        hits = np.flatnonzero(scores >= self.threshold)
+        hits = hits[top_k_indices(scores[hits], top_k)]
+        return [(self._labels[i], float(scores[i])) for i in hits.tolist()]
 
 
 @dataclass
@@ -47,18 +92,59 @@ class LinearReadoutDecoder:
     W: np.ndarray  # shape: (num_labels, num_ensembles)
     labels: List[str]
 
+    # Preallocated buffers so decode() does not allocate on the hot path
+    _scratch_v: np.ndarray = field(init=False, repr=False, compare=False)
+    _scratch_scores: np.ndarray = field(init=False, repr=False, compare=False)
+    # Concept row for each name in ensemble_order (missing names -> trailing 0),
+    # valid for the (weakref'd) Concept, layout_version and ensemble_order
+    # snapshot in _prepared_for. Scratch buffers and cache are not pickled.
+    _gather: np.ndarray = field(
+        default_factory=lambda: np.zeros(0, dtype=np.intp), init=False, repr=False, compare=False
+    )
+    _prepared_for: Optional[Tuple["weakref.ref[Concept]", int, Tuple[str, ...]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self.W = np.ascontiguousarray(self.W, dtype=np.float32)
+        self._alloc_scratch()
+
+    def _alloc_scratch(self) -> None:
+        self._scratch_v = np.empty(self.W.shape[1], dtype=np.float32)
+        self._scratch_scores = np.empty(self.W.shape[0], dtype=np.float32)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        for k in ("_scratch_v", "_scratch_scores", "_gather"):
+            del state[k]
+        state["_prepared_for"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._gather = np.zeros(0, dtype=np.intp)
+        self._alloc_scratch()
+
+    def _gather_rows(self, concept: Concept) -> np.ndarray:
+        """Row index into concept.activation_vector() (plus a 0 slot) per ensemble name."""
+        p = self._prepared_for
+        order = tuple(self.ensemble_order)
+        if p is None or p[0]() is not concept or p[1] != concept.layout_version or p[2] != order:
+            index = concept.ensemble_index()
+            missing = len(concept.ensembles_by_id)
+            self._gather = np.array([index.get(n, missing) for n in order], dtype=np.intp)
+            self._prepared_for = (weakref.ref(concept), concept.layout_version, order)
+        return self._gather
+
     def vectorize(self, concept: Concept) -> np.ndarray:
         """Concatenate activations in the specified order into a vector."""
-        v = []
-        for n in self.ensemble_order:
-            e = concept.get_ensemble(n)
-            v.append(e.activation if e else 0.0)
-        return np.array(v, dtype=float)
-
-    def decode(self, concept: Concept) -> List[Tuple[str, float]]:
-        """Compute scores = W @ v and return sorted (label, score)."""
-        v = self.vectorize(concept)
-        scores = (self.W @ v.reshape(-1, 1)).flatten()
-        out = list(zip(self.labels, [float(s) for s in scores]))
-        out.sort(key=lambda x: x[1], reverse=True)
-        return out
+        return np.append(concept.activation_vector(), 0.0)[self._gather_rows(concept)]
+
+    def decode(self, concept: Concept, top_k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Compute scores = W @ v and return sorted (label, score).
+
+        With `top_k`, only the k best labels are selected and sorted.
+        """
+        self._scratch_v[:] = self.vectorize(concept)
+        scores = np.dot(self.W, self._scratch_v, out=self._scratch_scores)
+        return [(self.labels[i], float(scores[i])) for i in top_k_indices(scores, top_k).tolist()]
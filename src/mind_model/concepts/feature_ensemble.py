@@ -6,48 +6,171 @@ maintain activation, links, decay, and Hebbian updates. They are not the
 spatiotemporal runtime ensembles; see cell_ensemble_rt.py for that.
 """
 from __future__ import annotations
-import math
+import threading
 import uuid
-from dataclasses import dataclass, field
-from typing import Dict, List
+from dataclasses import InitVar, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from mind_model.utils.vector_utils import VectorLike, as_vector, normalize
 
+# Process-wide ensemble ids: small ints hash far faster than UUIDs in link dicts.
+# Unpickled ensembles reserve their ids so new ones never reuse them.
+_id_lock = threading.Lock()
+_last_ensemble_id = 0
 
-@dataclass
+
+def _next_ensemble_id() -> int:
+    global _last_ensemble_id
+    with _id_lock:
+        _last_ensemble_id += 1
+        return _last_ensemble_id
+
+
+def _reserve_ensemble_id(ensemble_id: int) -> None:
+    global _last_ensemble_id
+    with _id_lock:
+        _last_ensemble_id = max(_last_ensemble_id, ensemble_id)
+
+
+class LinkDict(dict):
+    """Link map (target ensemble id -> weight) that counts its own edits.
+
+    `version` grows on every mutation, including direct `links[t] = w`
+    writes, so an owning Concept can tell when to re-pack its link arrays.
+    """
+    __slots__ = ("version",)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (LinkDict, (dict(self),), self.version)
+
+    def __setstate__(self, version: int) -> None:
+        self.version = version
+
+    def __setitem__(self, key: int, value: float) -> None:
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key: int) -> None:
+        super().__delitem__(key)
+        self.version += 1
+
+    def __ior__(self, other: Any) -> "LinkDict":
+        self.update(other)
+        return self
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def setdefault(self, key: int, default: float = 0.0) -> float:
+        self.version += 1
+        return super().setdefault(key, default)
+
+    def pop(self, *args: Any) -> Any:
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self) -> Tuple[int, float]:
+        self.version += 1
+        return super().popitem()
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+
+@dataclass(slots=True, eq=False)
 class FeatureEnsemble:
     """A feature-level ensemble held by a Concept (cell assembly).
 
     Stores a feature vector, current activation value, and weighted links to
-    peer FeatureEnsembles inside the same Concept.
+    peer FeatureEnsembles inside the same Concept. Slotted, since Concept
+    reads and writes `activation` on every ensemble each step. Compares by
+    identity: every ensemble has its own id, and array fields do not support
+    field-wise ==.
     """
     name: str
     modality: str
-    vector: List[float] = field(default_factory=list)
+    vector: InitVar[Optional[VectorLike]] = None
     description: str = ""
 
     # Runtime state
     activation: float = 0.0
 
     # Identity and links
-    ensemble_id: uuid.UUID = field(default_factory=uuid.uuid4, init=False)
-    links: Dict[uuid.UUID, float] = field(default_factory=dict)
+    ensemble_id: int = field(default_factory=_next_ensemble_id, init=False)
+    links: InitVar[Optional[Dict[int, float]]] = None
+    # UUID used only in serialized engrams; created on first external_id() call
+    ensemble_uuid: Optional[uuid.UUID] = field(default=None, init=False, repr=False, compare=False)
+
+    # Storage behind the `vector` and `links` properties (attached below the
+    # class, since a slotted dataclass cannot also declare them as fields).
+    # _unit_vector is the L2-normalized float32 copy of `vector`; _vector_gen
+    # counts assignments so owners can tell when to re-stack rows
+    _vector: np.ndarray = field(init=False, repr=False, compare=False)
+    _links: LinkDict = field(init=False, repr=False, compare=False)
+    _unit_vector: np.ndarray = field(init=False, repr=False, compare=False)
+    _vector_gen: int = field(default=-1, init=False, repr=False, compare=False)
+
+    def __post_init__(self, vector: Optional[VectorLike], links: Optional[Dict[int, float]]) -> None:
+        self._set_vector(np.zeros(0) if vector is None else vector)
+        self._set_links({} if links is None else links)
+
+    def _set_vector(self, value: VectorLike) -> None:
+        # Private read-only copy at the caller's precision: edits must go
+        # through assignment so _unit_vector stays in sync
+        value = np.array(value)
+        if value.dtype.kind != "f":
+            value = value.astype(np.float64)
+        value.flags.writeable = False
+        self._vector = value
+        self._unit_vector = normalize(as_vector(value))
+        self._vector_gen += 1
+
+    def _set_links(self, value: Dict[int, float]) -> None:
+        # Copy into a LinkDict whose version continues past the old one's
+        old = getattr(self, "_links", None)
+        links = LinkDict(value)
+        links.version = old.version + 1 if old is not None else 0
+        self._links = links
+
+    def __repr__(self) -> str:
+        return (
+            f"FeatureEnsemble(name={self.name!r}, modality={self.modality!r}, "
+            f"vector={self._vector!r}, description={self.description!r}, "
+            f"activation={self.activation!r}, ensemble_id={self.ensemble_id!r}, "
+            f"links={dict(self._links)!r})"
+        )
+
+    def __setstate__(self, state: Tuple[None, Dict[str, Any]]) -> None:
+        for key, value in state[1].items():
+            object.__setattr__(self, key, value)
+        self.vector.flags.writeable = False
+        _reserve_ensemble_id(self.ensemble_id)
 
     # -------------------------- Utilities --------------------------
-    @staticmethod
-    def _cosine(a: List[float], b: List[float]) -> float:
-        """Cosine similarity; returns 0.0 if vectors are incompatible."""
-        if not a or not b or len(a) != len(b):
+    def similarity(self, cue_vector: VectorLike) -> float:
+        """Cosine similarity to an external cue vector, used for direct activation.
+
+        Returns 0.0 if the cue is empty or its shape differs from `vector`.
+        """
+        cue = as_vector(cue_vector)
+        if cue.size == 0 or cue.shape != self._unit_vector.shape:
             return 0.0
-        dot = sum(x * y for x, y in zip(a, b))
-        na = math.sqrt(sum(x * x for x in a))
-        nb = math.sqrt(sum(y * y for y in b))
-        return 0.0 if na == 0.0 or nb == 0.0 else dot / (na * nb)
+        return float(self._unit_vector @ normalize(cue))
 
-    def similarity(self, cue_vector: List[float]) -> float:
-        """Similarity to an external cue vector, used for direct activation."""
-        return self._cosine(self.vector, cue_vector)
+    def external_id(self) -> uuid.UUID:
+        """Stable UUID identifying this ensemble outside the process."""
+        if self.ensemble_uuid is None:
+            self.ensemble_uuid = uuid.uuid4()
+        return self.ensemble_uuid
 
     # ----------------------- Structure ops -------------------------
-    def add_link(self, target_id: uuid.UUID, weight: float = 0.0) -> None:
+    def add_link(self, target_id: int, weight: float = 0.0) -> None:
         """Create or increment a link to another FeatureEnsemble."""
         self.links[target_id] = self.links.get(target_id, 0.0) + weight
 
@@ -57,7 +180,7 @@ class FeatureEnsemble:
         f = max(0.0, min(1.0, fraction))
         self.activation *= (1.0 - f)
 
-    def hebbian(self, coactive_ids: List[uuid.UUID], learning_rate: float = 0.05) -> None:
+    def hebbian(self, coactive_ids: List[int], learning_rate: float = 0.05) -> None:
         """Local Hebbian update for links to co-active ensembles.
 
         For each ensemble ID in coactive_ids (excluding self), increment link
@@ -67,3 +190,11 @@ class FeatureEnsemble:
             if t == self.ensemble_id:
                 continue
             self.links[t] = self.links.get(t, 0.0) + learning_rate * self.activation
+
+
+FeatureEnsemble.vector = property(  # type: ignore[assignment]
+    lambda self: self._vector, FeatureEnsemble._set_vector, doc="Feature vector (read-only array)."
+)
+FeatureEnsemble.links = property(  # type: ignore[assignment]
+    lambda self: self._links, FeatureEnsemble._set_links, doc="Link weights by target ensemble id."
+)
@@ -8,8 +8,9 @@ These are modality-agnostic building blocks used by ensembles and concepts.
 """
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 import numpy as np
+from mind_model.utils.vector_utils import as_vector, frozen_vector, normalize
 
 
 @dataclass
@@ -23,7 +24,8 @@ class FeatureUnit:
     modality : str
         Modality tag (e.g., "vision", "language", "audio").
     vector : Optional[np.ndarray]
-        Embedding/tensor for similarity and retrieval.
+        Embedding/tensor for similarity and retrieval. Stored as a read-only array
+        (copied unless already read-only); assign a new one to change it.
     attributes : Dict[str, str]
         Arbitrary metadata (e.g., {"category": "shape"}).
     """
@@ -32,6 +34,18 @@ class FeatureUnit:
     vector: Optional[np.ndarray] = None
     attributes: Dict[str, str] = field(default_factory=dict)
 
+    # Unit-norm float32 copy (None without a vector) so UnitStore.cosine is one
+    # dot; float32 halves the bytes streamed per similarity vs float64.
+    _unit_vector: Optional[np.ndarray] = field(init=False, repr=False, compare=False)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        if key == "vector":
+            if value is not None:
+                value = frozen_vector(value)
+            unit = None if value is None else normalize(as_vector(value))
+            object.__setattr__(self, "_unit_vector", unit)
+        object.__setattr__(self, key, value)
+
 
 class UnitStore:
     """A minimal registry mapping unit keys to FeatureUnit objects.
@@ -55,7 +69,24 @@ class UnitStore:
         ub = self.get(b)
         if ua is None or ub is None or ua.vector is None or ub.vector is None:
             return 0.0
-        va, vb = ua.vector, ub.vector
-        na = float(np.linalg.norm(va))
-        nb = float(np.linalg.norm(vb))
-        return float(np.dot(va, vb) / (na * nb)) if na > 0.0 and nb > 0.0 else 0.0
+        # Unit vectors are pre-normalized, so cosine is a single dot product
+        return float(np.dot(ua._unit_vector, ub._unit_vector))
+
+    def cosine_matrix(self, keys: List[str]) -> np.ndarray:
+        """Pairwise cosine similarities among `keys` as a (k, k) array.
+
+        Missing units or units without vectors score 0.0 against everything,
+        matching cosine(). Computed as one matrix product when all vectors
+        share a 1-D shape.
+        """
+        units = [self.get(k) for k in keys]
+        vecs = [u._unit_vector for u in units if u is not None and u.vector is not None]
+        shapes = {v.shape for v in vecs}
+        if len(shapes) > 1 or any(len(s) != 1 for s in shapes):
+            return np.array([[self.cosine(a, b) for b in keys] for a in keys], dtype=np.float64)
+        dim = next(iter(shapes))[0] if shapes else 0
+        U = np.zeros((len(keys), dim), dtype=np.float32)
+        for i, u in enumerate(units):
+            if u is not None and u.vector is not None:
+                U[i] = u._unit_vector
+        return U @ U.T
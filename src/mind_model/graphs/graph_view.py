@@ -5,7 +5,8 @@ Build a PyVis network from selected Concept objects and render into Streamlit
 via st.components.v1.html. Nodes are concepts, edges are relationships.
 """
 from __future__ import annotations
-from typing import Dict, List
+from typing import Dict, Tuple
+import uuid
 from pyvis.network import Network
 from mind_model.concepts.concept import Concept
 
@@ -14,21 +15,27 @@ def build_graph(concepts: Dict[str, Concept], physics: bool = True) -> Network:
     net = Network(height="600px", width="100%", directed=True, notebook=False)
     net.barnes_hut() if physics else net.hrepulsion()
 
-    # Map concept_id -> label
-    id_to_label: Dict[str, str] = {}
+    # Stringify each concept id once; edges reuse these (and cache targets)
+    id_str: Dict[uuid.UUID, str] = {c.concept_id: str(c.concept_id) for c in concepts.values()}
+    nodes: Dict[str, Tuple[str, str]] = {}  # first label wins for shared concepts
     for label, c in concepts.items():
-        node_id = str(c.concept_id)
-        id_to_label[node_id] = label
-        title = f"<b>{label}</b><br/>{c.description}<br/>ensembles: {len(c.ensembles_by_id)}"
-        net.add_node(node_id, label=label, title=title)
+        nodes.setdefault(
+            id_str[c.concept_id],
+            (label, f"<b>{label}</b><br/>{c.description}<br/>ensembles: {len(c.ensembles_by_id)}"),
+        )
+    net.add_nodes(
+        list(nodes),
+        label=[lbl for lbl, _ in nodes.values()],
+        title=[title for _, title in nodes.values()],
+    )
 
     # Add edges
-    for label, c in concepts.items():
-        src_id = str(c.concept_id)
+    for c in concepts.values():
+        src_id = id_str[c.concept_id]
         for r in c.relationships:
-            dst_id = str(r.target_concept_id)
-            # Show label for destination if we have it; otherwise keep raw id
-            dst_label = id_to_label.get(dst_id, dst_id[:8])
+            dst_id = id_str.get(r.target_concept_id)
+            if dst_id is None:
+                dst_id = id_str[r.target_concept_id] = str(r.target_concept_id)
             net.add_edge(src_id, dst_id, label=r.relation_type)
 
     return net
@@ -7,14 +7,20 @@ so the GUI can show the inter-concept relationship effects for every action.
 from __future__ import annotations
 from typing import Dict, List, Tuple, Set, Optional
 from copy import deepcopy
-import uuid  # ← Add this line
+import math
+import operator
+import numpy as np
 from mind_model.concepts.concept import Concept
 from mind_model.concepts.feature_ensemble import FeatureEnsemble
-from mind_model.utils.relations_utils import list_relations, diff_relations
+from mind_model.utils.relations_utils import list_relations, diff_relations, relation_key_set
 
 
 Result = Tuple[Optional[Concept], Dict[str, List[Tuple[str, str, str]]], str]
 
+# compare_concepts scores vector groups of at most this many elements
+# (rows * dim) in pure Python; larger groups go through batched NumPy
+_SCALAR_COSINE_MAX = 64
+
 
 # ----------------------- Helpers -----------------------
 
@@ -22,11 +28,21 @@ def _ensemble_name_set(c: Concept) -> Set[str]:
     return set(c.ensembles_by_name.keys())
 
 
+_ATOMIC = (str, int, float, bool, bytes, type(None))
+
+
+def _copy_metadata(md: Dict) -> Dict:
+    """dict.copy() when every value is an immutable scalar, else deepcopy."""
+    if all(type(v) in _ATOMIC for v in md.values()):
+        return md.copy()
+    return deepcopy(md)
+
+
 def _copy_concept_shallow(c: Concept, new_name: str) -> Concept:
     nc = Concept(
         name=new_name,
         description=f"Derived from {c.name}",
-        metadata=deepcopy(c.metadata),
+        metadata=_copy_metadata(c.metadata),
         inhibition_gain=c.inhibition_gain,
         activation_threshold=c.activation_threshold,
     )
@@ -37,7 +53,14 @@ def _copy_concept_shallow(c: Concept, new_name: str) -> Concept:
 
 def compare_concepts(a: Concept, b: Concept) -> Result:
     """Return structural/semantic metrics; no new concept is created."""
-    from math import sqrt
+    if a is b:
+        # Same object (e.g. both GUI pickers on one concept): every shared vector
+        # matches itself, so only zero/empty vectors fall short of cosine 1.0
+        n = len(a.ensembles_by_name)
+        live = sum(1 for eid in a.ensembles_by_name.values() if a.ensembles_by_id[eid]._unit_vector.any())
+        mean_cos = live / n if n else 0.0
+        notes = f"Compare: jaccard=1.000, mean_vector_cosine={mean_cos:.3f}, link_density_diff=0.000"
+        return None, {"added": [], "removed": []}, notes
 
     na = _ensemble_name_set(a)
     nb = _ensemble_name_set(b)
@@ -45,29 +68,38 @@ def compare_concepts(a: Concept, b: Concept) -> Result:
     union = na | nb
     jaccard = len(inter) / len(union) if union else 1.0
 
-    def cosine(u: List[float], v: List[float]) -> float:
-        if not u or not v or len(u) != len(v):
-            return 0.0
-        dot = sum(x * y for x, y in zip(u, v))
-        nu = sqrt(sum(x * x for x in u))
-        nv = sqrt(sum(y * y for y in v))
-        return 0.0 if nu == 0.0 or nv == 0.0 else dot / (nu * nv)
-
-    cos_vals: List[float] = []
-    for n in inter:
-        ea = a.get_ensemble(n)
-        eb = b.get_ensemble(n)
-        if ea and eb:
-            cos_vals.append(cosine(ea.vector, eb.vector))
-    mean_cos = sum(cos_vals) / len(cos_vals) if cos_vals else 0.0
+    # Stack shared ensemble vectors per dimension and score each group in one
+    # batched pass; mismatched or zero vectors contribute a cosine of 0.0
+    shared = sorted(inter)
+    groups: Dict[int, Tuple[List[np.ndarray], List[np.ndarray]]] = {}
+    for n in shared:
+        u = a.get_ensemble(n).vector
+        v = b.get_ensemble(n).vector
+        if len(u) == len(v):
+            us, vs = groups.setdefault(len(u), ([], []))
+            us.append(u)
+            vs.append(v)
+    cos_sum = 0.0
+    for dim, (us, vs) in groups.items():
+        if len(us) * dim <= _SCALAR_COSINE_MAX:
+            # Tiny groups: C-level math on Python floats beats NumPy call overhead
+            for u, v in zip(us, vs):
+                ul, vl = u.tolist(), v.tolist()
+                nu, nv = math.hypot(*ul), math.hypot(*vl)
+                if nu > 0.0 and nv > 0.0:
+                    cos_sum += math.fsum(map(operator.mul, ul, vl)) / (nu * nv)
+            continue
+        A = np.asarray(us, dtype=np.float32).reshape(len(us), dim)
+        B = np.asarray(vs, dtype=np.float32).reshape(len(vs), dim)
+        dots = np.einsum("ij,ij->i", A, B)
+        norms = np.linalg.norm(A, axis=1) * np.linalg.norm(B, axis=1)
+        nz = norms > 0.0
+        cos_sum += float((dots[nz] / norms[nz]).sum())
+    mean_cos = cos_sum / len(shared) if shared else 0.0
 
     def avg_link_density(c: Concept) -> float:
-        if not c.ensembles_by_id:
-            return 0.0
-        s = 0.0
-        for e in c.ensembles_by_id.values():
-            s += float(len(e.links))
-        return s / float(len(c.ensembles_by_id))
+        n = len(c.ensembles_by_id)
+        return sum([len(e.links) for e in c.ensembles_by_id.values()]) / n if n else 0.0
 
     link_density_diff = abs(avg_link_density(a) - avg_link_density(b))
 
@@ -84,42 +116,35 @@ def merge_concepts(a: Concept, b: Concept, new_name: str = "Merged") -> Result:
     before_rels = []
     c = _copy_concept_shallow(a, new_name)
 
-    # Copy all ensembles from A
+    # Copy all ensembles from A, recording source id -> new id
+    a_src_to_new: Dict[int, int] = {}
     for ea in a.ensembles_by_id.values():
         na = FeatureEnsemble(
             name=ea.name, modality=ea.modality,
-            vector=list(ea.vector), description=ea.description
+            vector=ea.vector.copy(), description=ea.description
         )
         c.add_ensemble(na)
+        a_src_to_new[ea.ensemble_id] = na.ensemble_id
 
     # Copy all ensembles from B (resolve name collisions)
+    b_src_to_new: Dict[int, int] = {}
     for eb in b.ensembles_by_id.values():
         name_b = eb.name if eb.name not in c.ensembles_by_name else f"{eb.name}__B"
         nb = FeatureEnsemble(
             name=name_b, modality=eb.modality,
-            vector=list(eb.vector), description=eb.description
+            vector=eb.vector.copy(), description=eb.description
         )
         c.add_ensemble(nb)
+        b_src_to_new[eb.ensemble_id] = nb.ensemble_id
 
-    # Copy intra-ensemble links within each source block
-    name_to_id = {e.name: eid for eid, e in c.ensembles_by_id.items()}
-
-    def copy_links(src: Concept, suffix: str = "") -> None:
+    # Copy intra-ensemble links within each source block, remapped by id
+    for src, src_to_new in ((a, a_src_to_new), (b, b_src_to_new)):
         for e in src.ensembles_by_id.values():
-            sname = e.name if suffix == "" else (e.name + suffix)
-            sid = name_to_id.get(sname)
-            if sid is None:
-                continue
-            se = c.ensembles_by_id[sid]
+            links = c.ensembles_by_id[src_to_new[e.ensemble_id]].links
             for tid, w in e.links.items():
-                tname = src.ensembles_by_id[tid].name
-                tname2 = tname if suffix == "" else (tname + suffix)
-                tid2 = name_to_id.get(tname2)
-                if tid2 is not None:
-                    se.links[tid2] = w
-
-    copy_links(a, suffix="")
-    copy_links(b, suffix="__B")
+                new_tid = src_to_new.get(tid)
+                if new_tid is not None:
+                    links[new_tid] = w
 
     # NEW: link merged concept back to its sources
     c.add_relationship("MERGED_FROM", a.concept_id, description=f"source:{a.name}")
@@ -147,8 +172,9 @@ def intersect_concepts(a: Concept, b: Concept, new_name: str = "Intersect") -> R
     result = _copy_concept_shallow(a, new_name)
     shared_names = _ensemble_name_set(a) & _ensemble_name_set(b)
 
-    # Map original ensemble names -> new ensemble IDs in the result
-    name_to_new_id = {}
+    # Map source ensemble IDs in A -> new ensemble IDs in the result
+    src_to_new: Dict[int, int] = {}
+    kept: List[FeatureEnsemble] = []
     for n in shared_names:
         ea = a.get_ensemble(n)
         if not ea:
@@ -156,35 +182,29 @@ def intersect_concepts(a: Concept, b: Concept, new_name: str = "Intersect") -> R
         ne = FeatureEnsemble(
             name=ea.name,
             modality=ea.modality,
-            vector=list(ea.vector),
+            vector=ea.vector.copy(),
             description=ea.description,
         )
         result.add_ensemble(ne)
-        name_to_new_id[n] = ne.ensemble_id
+        src_to_new[ea.ensemble_id] = ne.ensemble_id
+        kept.append(ea)
 
     # Recreate links where both endpoints are still present
-    for n in shared_names:
-        ea = a.get_ensemble(n)
-        if not ea:
-            continue
-        se = result.get_ensemble(n)
-        if not se:
-            continue
+    for ea in kept:
+        links = result.ensembles_by_id[src_to_new[ea.ensemble_id]].links
         for t_id, w in ea.links.items():
-            t_name = a.ensembles_by_id[t_id].name
-            if t_name in name_to_new_id:
-                se.links[name_to_new_id[t_name]] = w
+            new_tid = src_to_new.get(t_id)
+            if new_tid is not None:
+                links[new_tid] = w
 
     # ---- 2) Intersect relationships (A and B share same relation_type + target) ----
-    # Represent each relation as (type, target_uuid_str) for set math
-    rels_a = {(r.relation_type, str(r.target_concept_id)) for r in a.relationships}
-    rels_b = {(r.relation_type, str(r.target_concept_id)) for r in b.relationships}
-    shared_rels = rels_a & rels_b
+    # Each relation is a (type, target UUID) pair, cached per concept for set math
+    shared_rels = relation_key_set(a) & relation_key_set(b)
 
     # Add shared relations to the *new* intersect concept
-    for rel_type, target_id_str in shared_rels:
+    for rel_type, target_id in sorted(shared_rels):
         # Store a short note so the GUI can show provenance
-        result.add_relationship(rel_type, uuid.UUID(target_id_str), description="shared relation")
+        result.add_relationship(rel_type, target_id, description="shared relation")
 
     # ---- 3) Report relation deltas and notes for the GUI ----
     rel_delta = {"added": list_relations(result), "removed": []}
@@ -201,20 +221,19 @@ def subtract_concepts(a: Concept, b: Concept, new_name: str = "A_minus_B") -> Re
     nb = _ensemble_name_set(b)
 
     keep = [e for e in a.ensembles_by_id.values() if e.name not in nb]
-    name_to_new = {}
+    src_to_new: Dict[int, int] = {}
     for e in keep:
-        ne = FeatureEnsemble(name=e.name, modality=e.modality, vector=list(e.vector), description=e.description)
+        ne = FeatureEnsemble(name=e.name, modality=e.modality, vector=e.vector.copy(), description=e.description)
         c.add_ensemble(ne)
-        name_to_new[e.name] = ne.ensemble_id
+        src_to_new[e.ensemble_id] = ne.ensemble_id
 
+    # Links survive when both endpoints were kept
     for e in keep:
-        se = c.get_ensemble(e.name)
-        if not se:
-            continue
+        links = c.ensembles_by_id[src_to_new[e.ensemble_id]].links
         for tid, w in e.links.items():
-            tname = a.ensembles_by_id[tid].name
-            if tname in name_to_new:
-                se.links[name_to_new[tname]] = w
+            new_tid = src_to_new.get(tid)
+            if new_tid is not None:
+                links[new_tid] = w
 
     rel_delta = {"added": [], "removed": []}
     notes = "Subtraction created. Relations unchanged (derived concept has none by default)."
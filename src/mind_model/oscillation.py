@@ -7,6 +7,7 @@ These utilities can be used by drivers to coordinate stimulate()/learn() calls.
 from __future__ import annotations
 from typing import Iterable, List, Callable
 import math
+import numpy as np
 
 PhaseCallback = Callable[[float], None]
 
@@ -17,17 +18,18 @@ def phase_sequence(total_time: float, theta_hz: float, gamma_per_theta: int) ->
     Example: total_time=1.0, theta_hz=5, gamma_per_theta=4 -> ~5 theta cycles,
     each split into 4 gamma packet timestamps.
     """
-    phases: List[float] = []
-    if theta_hz <= 0 or gamma_per_theta <= 0 or total_time <= 0:
-        return phases
+    # Written as not (x > 0) so NaN inputs also give no phases
+    if not (theta_hz > 0 and gamma_per_theta > 0 and total_time > 0):
+        return []
     theta_period = 1.0 / theta_hz
-    t = 0.0
-    while t < total_time:
-        gamma_dt = theta_period / float(gamma_per_theta)
-        for i in range(gamma_per_theta):
-            phases.append(t + (i + 1) * gamma_dt)
-        t += theta_period
-    return phases
+    # Theta cycle starts in [0, total_time), accumulated by repeated addition
+    # like a running clock, each offset by the gamma packet grid
+    n = math.ceil(total_time * theta_hz) + 2
+    starts = np.zeros(n)
+    np.add.accumulate(np.full(n - 1, theta_period), out=starts[1:])
+    starts = starts[starts < total_time]
+    offsets = np.arange(1, gamma_per_theta + 1) * (theta_period / float(gamma_per_theta))
+    return (starts[:, None] + offsets).ravel().tolist()
 
 
 def run_phased(total_time: float, theta_hz: float, gamma_per_theta: int, on_phase: PhaseCallback) -> None:
@@ -4,53 +4,171 @@ persistence.py
 Persistence helpers to save/load Concepts (engram JSON) and UnitStore contents.
 """
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Dict, Any, List
+import itertools
 import json
+import math
+import os
 import uuid
 import numpy as np
 from mind_model.concepts.concept import Concept
 from mind_model.concepts.feature_unit import UnitStore, FeatureUnit
 
+try:  # optional: faster JSON encode/decode; the stdlib json module is the fallback
+    import orjson
+except ImportError:  # pragma: no cover – depends on the environment
+    orjson = None
+
+
+# ---------------- JSON I/O ----------------------
+
+def _has_nonfinite(obj: Any) -> bool:
+    """True if `obj` holds a NaN or infinite float anywhere inside it."""
+    if isinstance(obj, (float, np.floating)):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_nonfinite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        try:  # flat numeric lists (vectors) are checked at C speed
+            return not all(map(math.isfinite, obj))
+        except (TypeError, OverflowError):  # nested, non-numeric or huge ints
+            return any(_has_nonfinite(v) for v in obj)
+    if isinstance(obj, np.ndarray):
+        return obj.dtype.kind in "fc" and not np.isfinite(obj).all()
+    return False
+
+
+def _write_json(data: Any, path: str) -> None:
+    """Write `data` as indented UTF-8 JSON, via orjson when available.
+
+    Payloads orjson rejects (e.g. non-str keys in metadata) go through json,
+    as do payloads with NaN/Infinity, which orjson would write as null.
+    """
+    if orjson is not None and not _has_nonfinite(data):
+        try:
+            raw = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass
+        else:
+            with open(path, "wb") as f:
+                f.write(raw)
+            return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def _read_json(path: str) -> Any:
+    """Parse a JSON file, via orjson when available (json handles NaN/Infinity)."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
 
 # ---------------- Concept Engram ----------------
 
 def save_concept(concept: Concept, path: str) -> None:
     """Write a concept's serialized engram to disk as JSON."""
     data = concept.serialize_engram()
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    _write_json(data, path)
 
 
 def load_concept(path: str) -> Concept:
     """Load a concept from a JSON engram file."""
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = _read_json(path)
     return Concept.from_engram(data)
 
 
 # ---------------- UnitStore ---------------------
 
+def _vectors_path(path: str) -> str:
+    """Binary sidecar next to a UnitStore JSON file."""
+    return path + ".npz"
+
+
 def save_unit_store(store: UnitStore, path: str) -> None:
-    """Persist UnitStore to JSON; numpy arrays are converted to lists."""
+    """Persist UnitStore as JSON metadata plus an .npz sidecar of vectors.
+
+    Array vectors are flattened into one float64 buffer (`data`) with row
+    `offsets` and their `keys`; the JSON keeps each unit's modality,
+    attributes and vector shape. Non-array vectors stay inline in the JSON.
+    """
     blob: Dict[str, Any] = {}
+    keys: List[str] = []
+    flat: List[np.ndarray] = []
     for k, u in store._store.items():  # noqa: SLF001 – internal access OK for persistence
-        vec = u.vector.tolist() if isinstance(u.vector, np.ndarray) else u.vector
-        blob[k] = {
-            "modality": u.modality,
-            "vector": vec,
-            "attributes": u.attributes,
-        }
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(blob, f, ensure_ascii=False, indent=2)
+        entry: Dict[str, Any] = {"modality": u.modality, "attributes": u.attributes}
+        if isinstance(u.vector, np.ndarray):
+            entry["shape"] = list(u.vector.shape)
+            keys.append(k)
+            flat.append(u.vector.ravel())
+        else:
+            entry["vector"] = u.vector
+        blob[k] = entry
+    offsets = np.zeros(len(flat) + 1, dtype=np.int64)
+    np.cumsum([v.size for v in flat], out=offsets[1:])
+    data = np.concatenate(flat).astype(float, copy=False) if flat else np.zeros(0, dtype=float)
+    with open(_vectors_path(path), "wb") as f:
+        np.savez_compressed(f, keys=np.array(keys, dtype=str), data=data, offsets=offsets)
+    _write_json(blob, path)
+
+
+def _pool_vectors(rows: Dict[str, List[Any]]) -> Dict[str, np.ndarray]:
+    """Pack flat numeric lists into one float64 buffer and return a read-only view per key.
+
+    Nested or non-numeric lists fall back to one np.array per row.
+    """
+    sizes = [len(v) for v in rows.values()]
+    try:
+        data = np.fromiter(itertools.chain.from_iterable(rows.values()), dtype=float, count=sum(sizes))
+    except (TypeError, ValueError):
+        return {k: np.array(v, dtype=float) for k, v in rows.items()}
+    offsets = np.zeros(len(sizes) + 1, dtype=np.intp)
+    np.cumsum(sizes, out=offsets[1:])
+    data.flags.writeable = False  # read-only views are shared by FeatureUnit, not copied
+    return {k: data[offsets[i]:offsets[i + 1]] for i, k in enumerate(rows)}
 
 
 def load_unit_store(path: str) -> UnitStore:
-    """Load UnitStore from JSON (vectors reconstructed as numpy arrays when possible)."""
-    with open(path, "r", encoding="utf-8") as f:
-        blob = json.load(f)
+    """Load UnitStore from JSON, reading vectors from the .npz sidecar if present.
+
+    Files without a sidecar (older saves) carry vectors inline as lists; those
+    are pooled into one buffer too. Either way units hold read-only views of the
+buffer, not copies.
+
+    Raises FileNotFoundError if the JSON lists sidecar vectors ("shape"
+    entries) but the sidecar is missing, and ValueError if the sidecar lacks
+    some of those keys.
+    """
+    blob = _read_json(path)
+    expected = [k for k, d in blob.items() if "shape" in d]
+    packed: Dict[str, np.ndarray] = {}
+    if os.path.exists(_vectors_path(path)):
+        with np.load(_vectors_path(path)) as npz:
+            # Own the buffer (npz arrays sit on a writable base) and freeze it,
+            # so units can share read-only views of it
+            data, offsets = npz["data"].copy(), npz["offsets"]
+            data.flags.writeable = False
+            for i, k in enumerate(npz["keys"].tolist()):
+                packed[k] = data[offsets[i]:offsets[i + 1]]
+    elif expected:
+        raise FileNotFoundError(f"vector sidecar {_vectors_path(path)!r} for {path!r} is missing")
+    missing = [k for k in expected if k not in packed]
+    if missing:
+        raise ValueError(f"vector sidecar {_vectors_path(path)!r} lacks vectors for {missing[:5]!r}")
+    inline = _pool_vectors({
+        k: d["vector"] for k, d in blob.items()
+        if "shape" not in d and isinstance(d.get("vector"), list)
+    })
     store = UnitStore()
     for k, d in blob.items():
-        vec = d.get("vector")
-        arr = np.array(vec, dtype=float) if isinstance(vec, list) else None
+        if "shape" in d:
+            arr = packed[k].reshape(d["shape"])
+        else:
+            arr = inline.get(k)
         store.add(FeatureUnit(key=k, modality=d.get("modality", "unknown"), vector=arr, attributes=d.get("attributes", {})))
     return store
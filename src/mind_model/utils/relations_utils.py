@@ -5,30 +5,73 @@ Helpers to inspect and diff Concept relationship edges so the GUI can display
 how operations affect the inter-concept graph (including "no changes").
 """
 from __future__ import annotations
-from typing import Dict, List, Tuple
+from typing import Any, Callable, Dict, FrozenSet, List, Tuple
+import uuid
+from weakref import WeakKeyDictionary
 from mind_model.concepts.concept import Concept
 
 RelationTuple = Tuple[str, str, str]  # (type, target_concept_id_str, description)
+RelationKey = Tuple[str, uuid.UUID]  # (type, target_concept_id)
+
+# Per-concept relation views, keyed by (rel_version, len(relationships)) so
+# edits made directly on `relationships` also invalidate them
+_rel_rows: "WeakKeyDictionary[Concept, Tuple[Tuple[int, int], List[RelationTuple]]]" = WeakKeyDictionary()
+_rel_keys: "WeakKeyDictionary[Concept, Tuple[Tuple[int, int], FrozenSet[RelationKey]]]" = WeakKeyDictionary()
+
+
+def _cached(cache: WeakKeyDictionary, concept: Concept, build: Callable[[Concept], Any]) -> Any:
+    key = (concept.rel_version, len(concept.relationships))
+    hit = cache.get(concept)
+    if hit is None or hit[0] != key:
+        hit = cache[concept] = (key, build(concept))
+    return hit[1]
 
 
 def list_relations(concept: Concept) -> List[RelationTuple]:
-    """Return this concept's relations as tuples for easy comparison/logging."""
-    rows: List[RelationTuple] = []
-    for r in concept.relationships:
-        rows.append((r.relation_type, str(r.target_concept_id), r.description))
-    return rows
+    """Return this concept's relations as tuples for easy comparison/logging.
+
+    Rebuilt only when the concept's relationships change; returns a fresh list.
+    """
+    rows = _cached(
+        _rel_rows,
+        concept,
+        lambda c: [(r.relation_type, str(r.target_concept_id), r.description) for r in c.relationships],
+    )
+    return list(rows)
+
+
+def relation_key_set(concept: Concept) -> FrozenSet[RelationKey]:
+    """Return the concept's (type, target UUID) pairs for set algebra (cached)."""
+    return _cached(
+        _rel_keys,
+        concept,
+        lambda c: frozenset((r.relation_type, r.target_concept_id) for r in c.relationships),
+    )
 
 
 def diff_relations(before: List[RelationTuple], after: List[RelationTuple]) -> Dict[str, List[RelationTuple]]:
     """Return added/removed relations as {'added': [...], 'removed': [...]}.
 
     Inputs are lists of RelationTuple; tuples must match exactly to be considered same.
+    Duplicates count (multiset diff), and both outputs are sorted for a stable UI.
     """
-    set_before = set(before)
-    set_after = set(after)
-    added = list(set_after - set_before)
-    removed = list(set_before - set_after)
-    # Sort for stable UI
-    added.sort(key=lambda x: (x[0], x[1], x[2]))
-    removed.sort(key=lambda x: (x[0], x[1], x[2]))
+    if before == after:
+        return {"added": [], "removed": []}
+    # Merge-walk sorted copies (plain tuple order: type, target, description)
+    b, a = sorted(before), sorted(after)
+    added: List[RelationTuple] = []
+    removed: List[RelationTuple] = []
+    i = j = 0
+    while i < len(b) and j < len(a):
+        if b[i] == a[j]:
+            i += 1
+            j += 1
+        elif b[i] < a[j]:
+            removed.append(b[i])
+            i += 1
+        else:
+            added.append(a[j])
+            j += 1
+    removed.extend(b[i:])
+    added.extend(a[j:])
     return {"added": added, "removed": removed}
@@ -0,0 +1,65 @@
+"""
+vector_utils.py
+
+Small NumPy helpers shared by ensembles, units and backends so that every
+similarity path stores vectors the same way (contiguous float32, optionally
+L2-normalized) and cosine reduces to a dot product.
+"""
+from __future__ import annotations
+from typing import Optional, Sequence, Union
+import numpy as np
+
+VectorLike = Union[Sequence[float], np.ndarray]
+
+
+def as_vector(v: VectorLike) -> np.ndarray:
+    """Return `v` as a contiguous float32 array (no copy if already one)."""
+    return np.ascontiguousarray(v, dtype=np.float32)
+
+
+def frozen_vector(v: VectorLike) -> np.ndarray:
+    """Return `v` as a read-only float array at its own precision (ints -> float64).
+
+    Arrays that are read-only down to their base are shared; anything else is
+    copied, so later edits to the caller's array cannot reach the result.
+    """
+    base = v
+    while isinstance(base, np.ndarray) and not base.flags.writeable:
+        base = base.base
+    if isinstance(v, np.ndarray) and v.dtype.kind == "f" and not isinstance(base, np.ndarray):
+        return v
+    out = np.array(v)
+    if out.dtype.kind != "f":
+        out = out.astype(np.float64)
+    out.flags.writeable = False
+    return out
+
+
+def normalize(v: np.ndarray) -> np.ndarray:
+    """Return v / ||v||, or zeros when the norm is 0 (so dots yield 0.0)."""
+    n = float(np.linalg.norm(v))
+    return v / n if n > 0.0 else np.zeros_like(v, dtype=np.result_type(v, np.float32))
+
+
+# Up to this many scores, one stable argsort beats argpartition + lexsort
+# (measured crossover between 512 and 768 scores for k=3)
+_PARTITION_MIN_SIZE = 512
+
+
+def top_k_indices(scores: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """Indices of the k largest scores, highest first (all of them if k is None).
+
+    Above _PARTITION_MIN_SIZE scores, selects with np.argpartition (O(n)) and
+    sorts only the k survivors; smaller inputs take one stable full sort,
+    which is cheaper there. Equal scores keep their original order.
+    """
+    n = scores.size
+    if k is not None and k <= 0:
+        return np.zeros(0, dtype=np.intp)
+    if k is None or k >= n or n <= _PARTITION_MIN_SIZE:
+        return np.argsort(-scores, kind="stable")[:k]
+    kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[: k - above.size]  # earliest ties win
+    idx = np.concatenate([above, ties])
+    return idx[np.lexsort((idx, -scores[idx]))]
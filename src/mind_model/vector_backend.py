@@ -5,9 +5,40 @@ Backend interface for vector similarity. We ship an in-memory backend now and
 leave hooks for FAISS/Chroma later without touching the app code.
 """
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Dict, List, Tuple, Protocol, Optional
 import numpy as np
+from mind_model.utils.vector_utils import top_k_indices
+
+
+Shape = Tuple[int, ...]
+
+# With search_workers > 1, large buckets are scored in row chunks on a thread
+# pool, each chunk keeping its own top-k; below _SEARCH_CHUNK_ROWS per chunk a
+# thread hop costs more than the matvec it would overlap.
+_SEARCH_CHUNK_ROWS = 16384
+
+
+def _cosines(V: np.ndarray, norms: np.ndarray, q: np.ndarray, q_norm: float) -> np.ndarray:
+    """(V @ q) / (norms * q_norm) per row, 0 where either norm is 0.
+
+    The per-vector cosine formula, batched: when the dot products are exact
+    (e.g. integer-valued vectors) scores match scoring one vector at a time
+    bit for bit, so tied vectors keep insertion order. Otherwise they may
+    differ from it in the last bit.
+    """
+    denom = norms * q_norm
+    return np.divide(V @ q, denom, out=np.zeros(V.shape[0]), where=denom != 0.0)
+
+
+def _chunk_top_k(
+    V: np.ndarray, norms: np.ndarray, q: np.ndarray, q_norm: float, lo: int, hi: int, k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Top-k (global row indices, scores) of rows lo:hi of V against q."""
+    scores = _cosines(V[lo:hi], norms[lo:hi], q, q_norm)
+    idx = top_k_indices(scores, k)
+    return idx + lo, scores[idx]
 
 
 class VectorBackend(Protocol):
@@ -16,39 +47,94 @@ class VectorBackend(Protocol):
     def search(self, query: np.ndarray, k: int = 5) -> List[Tuple[str, float]]: ...
 
 
-def _cosine(a: np.ndarray, b: np.ndarray) -> float:
-    na = float(np.linalg.norm(a))
-    nb = float(np.linalg.norm(b))
-    if na == 0.0 or nb == 0.0:
-        return 0.0
-    return float((a @ b) / (na * nb))
-
-
 @dataclass
 class InMemoryVectorBackend:
-    """Simplest possible backend: dict + cosine search."""
+    """Simplest possible backend: dict + cosine search.
+
+    Vectors are also bucketed by shape at insert time, and each bucket keeps
+    a lazily built row matrix and row norms, so a search scores only vectors
+    of the query's shape with one matmul.
+
+    `search_workers` > 1 opts in to scoring large buckets on that many
+    threads (pool created on first use). Off by default: the matmul may
+    already run on a multithreaded BLAS, so limit its threads when enabling.
+    """
     store: Dict[str, np.ndarray]
 
-    def __init__(self) -> None:
+    def __init__(self, search_workers: int = 1) -> None:
         self.store = {}
+        self.search_workers = max(1, search_workers)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._by_shape: Dict[Shape, Dict[str, np.ndarray]] = {}
+        # L2 norm of each stored vector, taken at add time
+        self._norms: Dict[str, float] = {}
+        # shape -> (keys, (N, D) rows in the store's float64, (N,) norms);
+        # dropped when the bucket changes
+        self._matrices: Dict[Shape, Tuple[List[str], np.ndarray, np.ndarray]] = {}
 
     def add(self, key: str, vector: np.ndarray) -> None:
-        self.store[key] = vector.astype(float)
+        v = vector.astype(float)
+        old = self.store.get(key)
+        self.store[key] = v
+        self._norms[key] = float(np.linalg.norm(v))
+        if old is not None and old.shape != v.shape:
+            bucket = self._by_shape[old.shape]
+            del bucket[key]
+            if not bucket:
+                del self._by_shape[old.shape]
+            self._matrices.pop(old.shape, None)
+            # Rare: rebuild the target bucket so it follows `store` order (tie order)
+            self._by_shape[v.shape] = {k: x for k, x in self.store.items() if x.shape == v.shape}
+        else:
+            self._by_shape.setdefault(v.shape, {})[key] = v
+        self._matrices.pop(v.shape, None)
 
     def get(self, key: str) -> Optional[np.ndarray]:
         return self.store.get(key)
 
+    def _matrix_for(self, shape: Shape) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Keys, flattened rows and row norms of the `shape` bucket."""
+        cached = self._matrices.get(shape)
+        if cached is None:
+            bucket = self._by_shape[shape]
+            keys = list(bucket)
+            V = np.array(list(bucket.values()), dtype=np.float64).reshape(len(keys), int(np.prod(shape)))
+            norms = np.array([self._norms[key] for key in keys], dtype=np.float64)
+            cached = self._matrices[shape] = (keys, V, norms)
+        return cached
+
     def search(self, query: np.ndarray, k: int = 5) -> List[Tuple[str, float]]:
         if query is None:
             return []
         q = query.astype(float)
-        scores: List[Tuple[str, float]] = []
-        for key, v in self.store.items():
-            if v.shape != q.shape:
-                continue
-            scores.append((key, _cosine(q, v)))
-        scores.sort(key=lambda x: x[1], reverse=True)
-        return scores[:k]
+        if q.shape not in self._by_shape:
+            return []
+        keys, V, norms = self._matrix_for(q.shape)
+        q_norm = float(np.linalg.norm(q))
+        q = q.reshape(-1)
+        k = max(k, 0)
+        n = V.shape[0]
+        n_chunks = min(self.search_workers, n // _SEARCH_CHUNK_ROWS)
+        if n_chunks < 2 or k >= n:
+            scores = _cosines(V, norms, q, q_norm)
+            idx = top_k_indices(scores, k)
+            top = scores[idx]
+        else:
+            bounds = np.linspace(0, n, n_chunks + 1).astype(int).tolist()
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.search_workers, thread_name_prefix="vector-search")
+            parts = list(self._pool.map(
+                lambda lo_hi: _chunk_top_k(V, norms, q, q_norm, lo_hi[0], lo_hi[1], k),
+                zip(bounds[:-1], bounds[1:]),
+            ))
+            # Merge candidates in row order so equal scores keep insertion order
+            cand = np.concatenate([p[0] for p in parts])
+            cand_scores = np.concatenate([p[1] for p in parts])
+            order = np.argsort(cand, kind="stable")
+            cand, cand_scores = cand[order], cand_scores[order]
+            sel = top_k_indices(cand_scores, k)
+            idx, top = cand[sel], cand_scores[sel]
+        return [(keys[i], float(s)) for i, s in zip(idx.tolist(), top.tolist())]
 
 
 # Placeholders for future extension without changing imports
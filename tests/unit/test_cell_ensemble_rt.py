@@ -0,0 +1,149 @@
+import math
+import pickle
+import random
+
+import pytest
+
+from mind_model.assemblies import cell_ensemble_rt
+from mind_model.assemblies.cell_ensemble_rt import CellEnsembleRT
+from mind_model.concepts.feature_unit import FeatureUnit, UnitStore
+
+
+def test_non_finite_spike_times_are_accepted():
+    e = CellEnsembleRT("e")
+    e.schedule_spike(math.inf, "late")
+    e.schedule_spike(math.nan, "never")
+    e.schedule_spike(-math.inf, "early")
+    e.schedule_spike(0.005, "now", 0.5)
+
+    assert e.activate_step() == {"now"}
+    assert e.to_vector((0.0, 1.0)) == [0.0, 0.0, 0.0, 0.0]
+    # units sort as early, late, never, now
+    assert e.to_vector((-math.inf, math.inf)) == [1.0, 1.0, 0.0, 0.0]
+    assert e.activate_step(math.inf) == {"late"}
+
+
+def test_weights_are_read_only_and_assignable():
+    e = CellEnsembleRT("e", weights={("c", "a"): 0.5, ("a", "b"): 0.25})
+    assert dict(e.weights) == {("a", "c"): 0.5, ("a", "b"): 0.25}
+    with pytest.raises(TypeError):
+        e.weights[("a", "d")] = 1.0
+
+    e.schedule_spike(0.005, "a")
+    e.schedule_spike(0.005, "b")
+    e.activate_step()
+    assert e.weights[("a", "c")] == pytest.approx(0.5 * e.decay)
+    assert e.weights[("a", "b")] == pytest.approx(0.25 * e.decay + e.eta_hebb)
+
+    e.weights = {("x", "y"): 1.0}
+    assert dict(e.weights) == {("x", "y"): 1.0}
+
+
+class _ReferenceEnsemble:
+    """Dict-based CellEnsembleRT (the original algorithm) to check the array version against."""
+
+    def __init__(self, registry=None, decay=0.999, max_weight=1.0):
+        self.units, self.schedule, self.weights = set(), {}, {}
+        self.registry, self.decay, self.max_weight, self.t = registry, decay, max_weight, 0.0
+
+    def schedule_spike(self, t, key, strength=1.0):
+        self.units.add(key)
+        self.schedule.setdefault(t, []).append((key, max(0.0, min(1.0, strength))))
+
+    def activate_step(self, dt=0.01):
+        t0, t1 = self.t, self.t + dt
+        fired = set()
+        for ts in [ts for ts in self.schedule if t0 < ts <= t1]:
+            fired.update(k for k, _ in self.schedule.pop(ts))
+        for key in list(self.weights):
+            self.weights[key] *= self.decay
+            if abs(self.weights[key]) < 1e-6:
+                del self.weights[key]
+        fl = list(fired)
+        for i in range(len(fl)):
+            for j in range(i + 1, len(fl)):
+                a, b = sorted((fl[i], fl[j]))
+                inc = 0.02
+                if self.registry is not None:
+                    inc *= 0.5 + 0.5 * max(0.0, self.registry.cosine(a, b))
+                self.weights[(a, b)] = min(self.weights.get((a, b), 0.0) + inc, self.max_weight)
+        self.t = t1
+        return fired
+
+    def overlap_with(self, other):
+        if not self.units and not other.units:
+            return 1.0
+        return len(self.units & other.units) / len(self.units | other.units)
+
+    def similarity(self, other):
+        keys = set(self.weights) | set(other.weights)
+        if not keys:
+            return self.overlap_with(other)
+        wa = [self.weights.get(k, 0.0) for k in keys]
+        wb = [other.weights.get(k, 0.0) for k in keys]
+        dot = sum(x * y for x, y in zip(wa, wb))
+        a2, b2 = sum(x * x for x in wa), sum(y * y for y in wb)
+        topo = dot / (math.sqrt(a2) * math.sqrt(b2)) if a2 > 0 and b2 > 0 else 0.0
+        return 0.6 * self.overlap_with(other) + 0.4 * max(0.0, topo)
+
+    def to_vector(self, window):
+        t0, t1 = window
+        counts = {k: 0.0 for k in sorted(self.units)}
+        for ts, events in self.schedule.items():
+            if t0 <= ts <= t1:
+                for k, s in events:
+                    if k in counts:
+                        counts[k] += s
+        return list(counts.values())
+
+
+def _assert_weights_close(actual, expected):
+    for key in set(actual) | set(expected):
+        # float32 slots may prune a weight one step apart from float64 near 1e-6
+        assert actual.get(key, 0.0) == pytest.approx(expected.get(key, 0.0), rel=1e-4, abs=2e-6)
+
+
+def test_matches_reference_on_random_spike_workload():
+    rng = random.Random(7)
+    store = UnitStore()
+    for i in range(30):
+        store.add(FeatureUnit(key=f"u{i}", modality="m", vector=[rng.uniform(-1, 1) for _ in range(6)]))
+    pairs = [
+        (
+            CellEnsembleRT(name, registry=store, decay=0.9, max_weight=0.03),
+            _ReferenceEnsemble(store, decay=0.9, max_weight=0.03),
+        )
+        for name in ("a", "b")
+    ]
+    for step in range(400):
+        for new, ref in pairs:
+            for _ in range(rng.randint(0, 5)):
+                # some spikes land a few steps ahead, some never fire (past)
+                t = new._t + rng.choice([0.005, 0.005, 0.025, -1.0])
+                key, strength = f"u{rng.randrange(30)}", rng.random()
+                new.schedule_spike(t, key, strength)
+                ref.schedule_spike(t, key, strength)
+            assert new.activate_step() == ref.activate_step()
+        if step % 50 == 49:
+            (a, ra), (b, rb) = pairs
+            # edit membership directly, bypassing add_units()
+            gone = sorted(a.units)[0]
+            a.units.discard(gone)
+            ra.units.discard(gone)
+            _assert_weights_close(dict(a.weights), ra.weights)
+            assert a.overlap_with(b) == ra.overlap_with(rb)
+            assert a.similarity(b) == pytest.approx(ra.similarity(rb), rel=1e-4)
+            window = (a._t - 1.5, a._t + 0.02)
+            assert a.to_vector(window) == pytest.approx(ra.to_vector(window))
+
+
+def test_pickled_ensemble_rebuilds_its_membership_mask(monkeypatch):
+    e = CellEnsembleRT("e", units={"a", "b"})
+    assert e.overlap_with(CellEnsembleRT("f", units={"a"})) == 0.5
+    blob = pickle.dumps(e)
+
+    # A fresh process interns unit keys in its own order
+    monkeypatch.setattr(cell_ensemble_rt, "_unit_bits", {"x": 0, "y": 1})
+    loaded = pickle.loads(blob)
+    assert loaded.overlap_with(CellEnsembleRT("h", units={"x", "y"})) == 0.0
+    assert loaded.overlap_with(CellEnsembleRT("g", units={"a", "b"})) == 1.0
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+import mind_model.concepts.concept as concept_mod
+from mind_model.concepts.concept import Concept
+from mind_model.concepts.feature_ensemble import FeatureEnsemble
+
+
+def _random_concept(n: int, seed: int) -> Concept:
+    rng = random.Random(seed)
+    c = Concept("c")
+    ensembles = [FeatureEnsemble(name=f"e{i}", modality="m", vector=[rng.random() for _ in range(4)]) for i in range(n)]
+    for e in ensembles:
+        c.add_ensemble(e)
+    for e in ensembles:
+        for t in rng.sample(ensembles, 3):
+            e.add_link(t.ensemble_id, rng.uniform(-0.2, 0.5))
+    return c
+
+
+@pytest.mark.parametrize("n", [4, 40])
+def test_scalar_and_batched_stimulate_agree(monkeypatch, n):
+    cues = {"e0": [1.0, 0.2, 0.0, 0.0], "e1": [0.0, 0.0, 0.0, 0.0], "e2": [1.0], "missing": [1.0, 0.0, 0.0, 0.0]}
+    results = []
+    for threshold in (10**9, 0):
+        monkeypatch.setattr(concept_mod, "_BATCH_MIN_ROWS", threshold)
+        c = _random_concept(n, seed=n)
+        results.append([c.stimulate(cues, gain=0.8) for _ in range(3)])
+    for scalar, batched in zip(*results):
+        assert scalar.keys() == batched.keys()
+        assert list(scalar.values()) == pytest.approx(list(batched.values()), abs=1e-4)
+
+
+@pytest.mark.parametrize("n", [4, 40])
+def test_reassigned_vector_and_links_reach_stimulate(n):
+    c = _random_concept(n, seed=1)
+    c.stimulate({"e0": [1.0, 0.0, 0.0, 0.0]})
+    e0 = c.get_ensemble("e0")
+    e0.vector = [0.0, 0.0, 0.0, 1.0]
+    assert not e0.vector.flags.writeable
+    e0.links = {e.ensemble_id: 1.0 for e in c.ensembles_by_id.values() if e is not e0}
+    for e in c.ensembles_by_id.values():
+        e.activation = 0.0
+    assert c.stimulate({"e0": [1.0, 0.0, 0.0, 0.0]})["e0"] == 0.0
+    act = c.stimulate({"e0": [0.0, 0.0, 0.0, 1.0]})
+    assert act["e0"] > 0.0
+    assert all(v > 0.0 for v in act.values())
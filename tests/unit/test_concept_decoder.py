@@ -0,0 +1,48 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from mind_model.concepts.concept import Concept
+from mind_model.concepts.concept_decoder import LinearReadoutDecoder, PopulationThresholdDecoder
+from mind_model.concepts.feature_ensemble import FeatureEnsemble
+
+
+@pytest.fixture
+def dog() -> Concept:
+    c = Concept("Dog")
+    for name, activation in (("shape_canine", 0.8), ("sound_bark", 0.1), ("word_dog", 0.0)):
+        c.add_ensemble(FeatureEnsemble(name=name, modality="m", vector=[1.0, 0.0]))
+        c.get_ensemble(name).activation = activation
+    return c
+
+
+def test_population_decoder_follows_label_edits(dog):
+    decoder = PopulationThresholdDecoder({"dog": ["shape_canine"]}, threshold=0.0)
+    assert decoder.decode(dog) == [("dog", 0.8)]
+
+    decoder.label_to_ensembles["bark"] = ["sound_bark"]
+    decoder.label_to_ensembles["dog"] = ["word_dog"]
+    assert decoder.decode(dog) == [("bark", 0.1), ("dog", 0.0)]
+
+
+def test_population_decoder_pickles_after_decode(dog):
+    decoder = PopulationThresholdDecoder({"dog": ["shape_canine", "word_dog"]}, threshold=0.0)
+    expected = decoder.decode(dog)
+    loaded = pickle.loads(pickle.dumps(decoder))
+    assert loaded.decode(dog) == expected
+
+
+def test_linear_decoder_follows_order_edits(dog):
+    decoder = LinearReadoutDecoder(["shape_canine", "sound_bark"], np.eye(2), ["a", "b"])
+    assert decoder.decode(dog) == [("a", pytest.approx(0.8)), ("b", pytest.approx(0.1))]
+
+    decoder.ensemble_order.reverse()
+    assert decoder.decode(dog) == [("b", pytest.approx(0.8)), ("a", pytest.approx(0.1))]
+
+
+def test_linear_decoder_pickles_after_decode(dog):
+    decoder = LinearReadoutDecoder(["shape_canine", "missing"], np.array([[1.0, 0.5], [0.0, 1.0]]), ["a", "b"])
+    expected = decoder.decode(dog)
+    loaded = pickle.loads(pickle.dumps(decoder))
+    assert loaded.decode(dog) == expected
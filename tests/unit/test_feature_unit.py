@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from mind_model.concepts.feature_unit import FeatureUnit, UnitStore
+
+
+def test_caller_edits_do_not_reach_stored_vectors():
+    v = np.array([1.0, 0.0])
+    store = UnitStore()
+    store.add(FeatureUnit(key="a", modality="m", vector=v))
+    store.add(FeatureUnit(key="b", modality="m", vector=np.array([0.0, 1.0])))
+    v[:] = [0.0, 1.0]
+
+    assert store.cosine("a", "b") == 0.0
+    with pytest.raises(ValueError):
+        store.get("a").vector[0] = 1.0
+
+
+def test_reassigned_vector_refreshes_cosine():
+    store = UnitStore()
+    store.add(FeatureUnit(key="a", modality="m", vector=[1.0, 0.0]))
+    store.add(FeatureUnit(key="b", modality="m", vector=[0.0, 1.0]))
+    store.get("a").vector = np.array([0.0, 2.0])
+
+    assert store.cosine("a", "b") == pytest.approx(1.0)
+    assert store.cosine_matrix(["a", "b"])[0, 1] == pytest.approx(1.0)
@@ -0,0 +1,33 @@
+from mind_model.concepts.concept import Concept
+from mind_model.concepts.feature_ensemble import FeatureEnsemble
+from mind_model.manipulations.manipulations import merge_concepts
+
+
+def _concept(name: str, weight: float) -> Concept:
+    c = Concept(name)
+    for n, v in (("shape", [1.0, 0.0]), ("color", [0.0, 1.0])):
+        c.add_ensemble(FeatureEnsemble(name=n, modality="vision", vector=v))
+    c.get_ensemble("shape").add_link(c.ensembles_by_name["color"], weight)
+    return c
+
+
+def _named_links(c: Concept):
+    names = {e.ensemble_id: e.name for e in c.ensembles_by_id.values()}
+    return {(e.name, names[t]): w for e in c.ensembles_by_id.values() for t, w in e.links.items()}
+
+
+def test_merge_keeps_links_from_both_sources():
+    a, b = _concept("Dog", 0.5), _concept("Cat", 0.25)
+    merged, _, _ = merge_concepts(a, b)
+
+    assert _named_links(merged) == {("shape", "color"): 0.5, ("shape__B", "color__B"): 0.25}
+    # The sources are left untouched
+    assert _named_links(a) == {("shape", "color"): 0.5}
+    assert _named_links(b) == {("shape", "color"): 0.25}
+
+
+def test_merged_links_drive_stimulation():
+    merged, _, _ = merge_concepts(_concept("Dog", 0.5), _concept("Cat", 0.25))
+    merged.stimulate({"shape__B": [1.0, 0.0]})
+    assert merged.get_ensemble("color__B").activation > 0.0
+    assert merged.get_ensemble("color").activation == 0.0
@@ -0,0 +1,20 @@
+import math
+
+import pytest
+
+from mind_model.oscillation import phase_sequence
+
+
+def test_phase_sequence_grid():
+    phases = phase_sequence(1.0, 5.0, 4)
+    assert len(phases) == 20
+    assert phases[:4] == pytest.approx([0.05, 0.1, 0.15, 0.2])
+    assert phases[-1] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize(
+    "total_time, theta_hz, gamma_per_theta",
+    [(math.nan, 5.0, 4), (1.0, math.nan, 4), (0.0, 5.0, 4), (1.0, -5.0, 4), (1.0, 5.0, 0)],
+)
+def test_phase_sequence_empty_for_invalid_inputs(total_time, theta_hz, gamma_per_theta):
+    assert phase_sequence(total_time, theta_hz, gamma_per_theta) == []
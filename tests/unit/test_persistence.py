@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+import pytest
+
+from mind_model.concepts.concept import Concept
+from mind_model.concepts.feature_ensemble import FeatureEnsemble
+from mind_model.concepts.feature_unit import FeatureUnit, UnitStore
+from mind_model.persistence import load_concept, load_unit_store, save_concept, save_unit_store
+
+
+def _store() -> UnitStore:
+    store = UnitStore()
+    store.add(FeatureUnit(key="edge", modality="vision", vector=np.array([0.1, 0.2, 0.3])))
+    store.add(FeatureUnit(key="patch", modality="vision", vector=np.arange(6.0).reshape(2, 3), attributes={"src": "v1"}))
+    store.add(FeatureUnit(key="tone", modality="audio"))
+    return store
+
+
+def test_unit_store_round_trip(tmp_path):
+    path = str(tmp_path / "units.json")
+    save_unit_store(_store(), path)
+    loaded = load_unit_store(path)
+
+    edge, patch, tone = loaded.get("edge"), loaded.get("patch"), loaded.get("tone")
+    np.testing.assert_array_equal(edge.vector, [0.1, 0.2, 0.3])
+    np.testing.assert_array_equal(patch.vector, np.arange(6.0).reshape(2, 3))
+    assert patch.attributes == {"src": "v1"}
+    assert tone.vector is None and tone.modality == "audio"
+
+
+def test_missing_sidecar_raises(tmp_path):
+    path = str(tmp_path / "units.json")
+    save_unit_store(_store(), path)
+    os.remove(path + ".npz")
+    with pytest.raises(FileNotFoundError):
+        load_unit_store(path)
+
+
+def test_sidecar_missing_keys_raises(tmp_path):
+    path = str(tmp_path / "units.json")
+    save_unit_store(_store(), path)
+    other = UnitStore()
+    other.add(FeatureUnit(key="edge", modality="vision", vector=np.ones(3)))
+    save_unit_store(other, str(tmp_path / "other.json"))
+    os.replace(str(tmp_path / "other.json.npz"), path + ".npz")
+    with pytest.raises(ValueError, match="patch"):
+        load_unit_store(path)
+
+
+def test_nonfinite_engram_values_survive_save(tmp_path):
+    concept = Concept("probe", metadata={"score": float("inf")})
+    concept.add_ensemble(FeatureEnsemble(name="f", modality="m", vector=[0.5, float("nan")]))
+    path = str(tmp_path / "probe.json")
+    save_concept(concept, path)
+    loaded = load_concept(path)
+
+    assert loaded.metadata["score"] == float("inf")
+    vec = loaded.get_ensemble("f").vector
+    assert vec[0] == 0.5 and np.isnan(vec[1])
+
+
+def test_loaded_vectors_are_shared_read_only_views(tmp_path):
+    path = str(tmp_path / "units.json")
+    save_unit_store(_store(), path)
+    loaded = load_unit_store(path)
+
+    edge, patch = loaded.get("edge").vector, loaded.get("patch").vector
+    assert not edge.flags.writeable
+    assert np.shares_memory(edge.base, patch.base)
@@ -0,0 +1,22 @@
+from mind_model.utils.relations_utils import diff_relations
+
+IS_A = ("IS_A", "t1", "")
+HAS = ("HAS", "t2", "tail")
+
+
+def test_identical_lists_have_no_changes():
+    assert diff_relations([IS_A, HAS], [IS_A, HAS]) == {"added": [], "removed": []}
+
+
+def test_duplicates_count_as_separate_relations():
+    assert diff_relations([IS_A], [IS_A, IS_A]) == {"added": [IS_A], "removed": []}
+    assert diff_relations([IS_A, IS_A, HAS], [IS_A]) == {"added": [], "removed": [HAS, IS_A]}
+
+
+def test_order_does_not_matter_and_outputs_are_sorted():
+    before = [HAS, IS_A]
+    after = [("USED_FOR", "t3", ""), IS_A, ("ANTONYM", "t4", "")]
+    assert diff_relations(before, after) == {
+        "added": [("ANTONYM", "t4", ""), ("USED_FOR", "t3", "")],
+        "removed": [HAS],
+    }
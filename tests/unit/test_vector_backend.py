@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+import mind_model.vector_backend as vb
+from mind_model.vector_backend import InMemoryVectorBackend
+
+
+def _scalar_search(store, q, k):
+    """Per-vector cosine search, as the backend scored before bucketing."""
+    scores = []
+    for key, v in store.items():
+        if v.shape != q.shape:
+            continue
+        nq, nv = float(np.linalg.norm(q)), float(np.linalg.norm(v))
+        scores.append((key, 0.0 if nq == 0.0 or nv == 0.0 else float((q @ v) / (nq * nv))))
+    scores.sort(key=lambda x: x[1], reverse=True)
+    return scores[:k]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_tied_integer_vectors_keep_insertion_order(monkeypatch, workers):
+    monkeypatch.setattr(vb, "_SEARCH_CHUNK_ROWS", 8)
+    rng = np.random.default_rng(0)
+    backend = InMemoryVectorBackend(search_workers=workers)
+    for i in range(60):
+        backend.add(f"k{i}", rng.integers(-2, 3, size=4) * rng.integers(1, 4))
+    backend.add("zero", np.zeros(4))
+    backend.add("other_shape", np.ones(3))
+    for q in (np.array([1, 0, 0, 0]), np.array([1, 1, -1, 2]), np.zeros(4)):
+        for k in (5, 61):
+            assert backend.search(q, k=k) == _scalar_search(backend.store, q.astype(float), k)
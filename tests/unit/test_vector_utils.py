@@ -0,0 +1,14 @@
+import numpy as np
+import pytest
+
+from mind_model.utils import vector_utils
+from mind_model.utils.vector_utils import top_k_indices
+
+
+@pytest.mark.parametrize("k", [None, 0, 1, 3, 7, 50])
+def test_top_k_partition_and_full_sort_agree(monkeypatch, k):
+    scores = np.random.default_rng(3).integers(0, 5, size=40).astype(float)  # many ties
+    full = top_k_indices(scores, k)
+    monkeypatch.setattr(vector_utils, "_PARTITION_MIN_SIZE", 0)
+    assert top_k_indices(scores, k).tolist() == full.tolist()
+    assert full.tolist() == sorted(range(40), key=lambda i: -scores[i])[:k]
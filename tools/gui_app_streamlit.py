@@ -3,6 +3,8 @@
 from __future__ import annotations
 import streamlit as st
 from typing import List, Dict
+import numpy as np
+import pandas as pd
 from mind_model.concepts.seed_concepts import list_catalog
 from mind_model.concepts.concept import Concept
 from mind_model.concepts.feature_ensemble import FeatureEnsemble
@@ -28,6 +30,21 @@ if "workspace" not in st.session_state:
 
 workspace: Dict[str, Concept] = st.session_state.workspace
 
+
+# ---------------- Cached renders ----------------
+def _graph_signature(ws: Dict[str, Concept]) -> tuple:
+    """Everything build_graph() reads, per concept; relationships via rel_version."""
+    return tuple(
+        (label, str(c.concept_id), c.description, len(c.ensembles_by_id), c.rel_version, len(c.relationships))
+        for label, c in ws.items()
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _graph_html(sig: tuple, _workspace: Dict[str, Concept]) -> str:
+    """PyVis HTML for the workspace, cached on `sig` (`_workspace` is not hashed)."""
+    return build_graph(_workspace).generate_html(notebook=False)
+
 # ---------------- Sidebar: Setup ----------------
 st.sidebar.header("Setup")
 num_concepts = st.sidebar.selectbox("Number of concepts", options=[2, 3], index=0)
@@ -55,12 +72,13 @@ with TAB_INSPECT:
         with cols[i]:
             st.markdown(f"**{c.name}** – {c.description}")
             st.write("Ensembles:")
-            items = []
-            for eid, e in c.ensembles_by_id.items():
-                items.append({
-                    "name": e.name, "modality": e.modality,
-                    "activation": round(e.activation, 4), "links": len(e.links),
-                })
+            es = list(c.ensembles_by_id.values())  # same row order as activation_vector()
+            items = pd.DataFrame({
+                "name": [e.name for e in es],
+                "modality": [e.modality for e in es],
+                "activation": np.round(c.activation_vector(), 4),
+                "links": [len(e.links) for e in es],
+            })
             st.dataframe(items, hide_index=True, use_container_width=True)
             st.write("Relations:")
             rows = [{"type": r[0], "target": r[1][:8], "desc": r[2]} for r in list_relations(c)]
@@ -121,8 +139,7 @@ with TAB_OPERATE:
 
 with TAB_GRAPH:
     st.subheader("Concept Graph (workspace)")
-    net = build_graph(workspace)
-    net_html = net.generate_html(notebook=False)
+    net_html = _graph_html(_graph_signature(workspace), workspace)
     components.html(net_html, height=620, scrolling=True)
     st.caption("Nodes are concepts; edges are relationships. Workspace includes results you added.")
 